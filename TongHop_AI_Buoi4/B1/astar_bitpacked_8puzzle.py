@@ -0,0 +1,201 @@
+import heapq
+
+GOAL = '12345678_'
+
+# Mỗi ô chiếm 4 bit: ô i nằm ở bit 4*i .. 4*i+3, ô trống ('_') mang giá trị 0.
+# Với bàn 3x3 cả trạng thái chỉ cần 36 bit, vừa trong một số nguyên 64 bit.
+BITS = 4
+MASK = 0xF
+
+# Hướng di chuyển của ô trống, cùng tên action với EightPuzzle.
+OFFSETS = {'LEFT': -1, 'RIGHT': 1, 'UP': -3, 'DOWN': 3}
+OPPOSITE = {'LEFT': 'RIGHT', 'RIGHT': 'LEFT', 'UP': 'DOWN', 'DOWN': 'UP'}
+
+
+def _build_moves():
+    """
+    MOVES[b] = danh sách (action, s, swap_mask) khi ô trống ở vị trí b.
+    swap_mask có nibble 1 ở cả b và s, nên state ^ tile * swap_mask
+    vừa xóa tile ở s vừa đặt tile vào b (ô trống bằng 0).
+    """
+    moves = []
+    for b in range(9):
+        acts = []
+        if b % 3 > 0: acts.append('LEFT')
+        if b % 3 < 2: acts.append('RIGHT')
+        if b // 3 > 0: acts.append('UP')
+        if b // 3 < 2: acts.append('DOWN')
+        moves.append([
+            (a, b + OFFSETS[a], (1 << BITS * b) | (1 << BITS * (b + OFFSETS[a])))
+            for a in acts
+        ])
+    return moves
+
+
+MOVES = _build_moves()
+
+
+def tile_code(tile):
+    """'_' -> 0, '1'..'8' -> 1..8"""
+    return 0 if tile == '_' else int(tile)
+
+
+def pack(state):
+    """Chuỗi 9 ký tự -> số nguyên 36 bit"""
+    packed = 0
+    for i, tile in enumerate(state):
+        packed |= tile_code(tile) << (BITS * i)
+    return packed
+
+
+def unpack(packed):
+    """Số nguyên 36 bit -> chuỗi 9 ký tự (định dạng state của EightPuzzle)"""
+    return ''.join(
+        str(t) if t else '_'
+        for t in ((packed >> (BITS * i)) & MASK for i in range(9))
+    )
+
+
+def manhattan_table(goal=GOAL):
+    """
+    DIST[t][p] = khoảng cách Manhattan của tile t (mã số nguyên) khi đứng ở vị trí p.
+    DIST[0] toàn 0 vì ô trống không tính vào heuristic.
+    """
+    table = [[0] * 9 for _ in range(9)]
+    for g, tile in enumerate(goal):
+        t = tile_code(tile)
+        if t == 0:
+            continue
+        for p in range(9):
+            table[t][p] = abs(p // 3 - g // 3) + abs(p % 3 - g % 3)
+    return table
+
+
+def packed_heuristic(packed, dist):
+    return sum(dist[(packed >> (BITS * i)) & MASK][i] for i in range(9))
+
+
+class PackedNode:
+    """
+    Node kết quả, có cùng các thuộc tính chính như SearchNode của simpleai
+    (state, action, parent, cost, depth, path()) để thay thế trực tiếp.
+    """
+    __slots__ = ('state', 'action', 'parent', 'cost', 'depth')
+
+    def __init__(self, state, action=None, parent=None, cost=0, depth=0):
+        self.state = state
+        self.action = action
+        self.parent = parent
+        self.cost = cost
+        self.depth = depth
+
+    def path(self):
+        node = self
+        path = []
+        while node:
+            path.append((node.action, node.state))
+            node = node.parent
+        return list(reversed(path))
+
+    def __repr__(self):
+        return f'Node <{self.state}>'
+
+
+def build_node(states, actions):
+    """Dựng chuỗi PackedNode từ danh sách state và action (action đầu là None)"""
+    node = None
+    for depth, (action, state) in enumerate(zip(actions, states)):
+        node = PackedNode(state, action, node, depth, depth)
+    return node
+
+
+def astar_packed(problem, graph_search=True, goal=GOAL, deadline=None):
+    """
+    A* cho 8-puzzle trên trạng thái đóng gói 4 bit/ô.
+
+    Thay thế trực tiếp cho astar(problem, graph_search=True) của simpleai:
+    nhận EightPuzzle (chỉ dùng problem.initial_state) và trả về node có path()
+    cùng định dạng [(action, state), ...], hoặc None nếu không giải được.
+    Luôn chạy graph search; tham số graph_search giữ lại cho cùng chữ ký.
+    deadline (common.deadline.Deadline hoặc object có expired()): hết hạn
+    thì trả về None.
+
+    Khóa trong heap là một số nguyên duy nhất:
+        f << 45 | h << 40 | blank << 36 | state
+    nên so sánh trong heap là so sánh int, ưu tiên f nhỏ rồi tới h nhỏ.
+    """
+    dist = manhattan_table(goal)
+    start = pack(problem.initial_state)
+    target = pack(goal)
+    blank = problem.initial_state.index('_')
+    h = packed_heuristic(start, dist)
+
+    # parent[state] = (state cha, action); g_score[state] = g tốt nhất đã biết
+    parent = {start: (None, None)}
+    g_score = {start: 0}
+    closed = set()
+    heap = [(h << 45) | (h << 40) | (blank << 36) | start]
+
+    state_mask = (1 << 36) - 1
+    while heap:
+        key = heapq.heappop(heap)
+        state = key & state_mask
+        if state in closed:
+            continue
+        if state == target:
+            return _rebuild(state, parent)
+        if deadline is not None and deadline.expired():
+            return None
+        closed.add(state)
+
+        h = (key >> 40) & 0x1F
+        g = (key >> 45) - h + 1
+        b = (key >> 36) & 0xF
+        for action, s, swap_mask in MOVES[b]:
+            tile = (state >> (BITS * s)) & MASK
+            child = state ^ (tile * swap_mask)
+            if child in closed or g >= g_score.get(child, g + 1):
+                continue
+            g_score[child] = g
+            parent[child] = (state, action)
+            ch = h + dist[tile][b] - dist[tile][s]
+            heapq.heappush(heap, ((g + ch) << 45) | (ch << 40) | (s << 36) | child)
+    return None
+
+
+def _rebuild(state, parent):
+    states, actions = [], []
+    while state is not None:
+        prev, action = parent[state]
+        states.append(unpack(state))
+        actions.append(action)
+        state = prev
+    states.reverse()
+    actions.reverse()
+    return build_node(states, actions)
+
+
+if __name__ == '__main__':
+    import time
+    from astar_8puzzle import EightPuzzle, is_solvable, print_board
+
+    # Khó nhất: 31 bước
+    board = [
+        [8, 6, 7],
+        [2, 5, 4],
+        [3, 0, 1]
+    ]
+    problem = EightPuzzle(board)
+    print("Trạng thái ban đầu:")
+    print_board(problem.initial_state)
+    if not is_solvable(board):
+        print("Không giải được!")
+    else:
+        start = time.perf_counter()
+        result = astar_packed(problem, graph_search=True)
+        elapsed = time.perf_counter() - start
+        path = result.path()
+        print(f"Số bước: {len(path) - 1}, thời gian: {elapsed * 1000:.1f} ms")
+        print("Các action:", ' '.join(action for action, _ in path[1:]))
+        print("Trạng thái cuối:")
+        print_board(result.state)
@@ -0,0 +1,249 @@
+import argparse
+import csv
+import json
+import os
+import shelve
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from astar_8puzzle import EightPuzzle, is_solvable
+from astar_bitpacked_8puzzle import astar_packed
+
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'solutions')
+
+
+def canonical(board):
+    """
+    Bàn 3x3 (list lồng nhau hoặc 9 số phẳng) -> chuỗi 9 ký tự như state của
+    EightPuzzle. ValueError nếu không phải 9 ô là một hoán vị của 0..8.
+    """
+    try:
+        flat = [cell for row in board for cell in row] if isinstance(board[0], (list, tuple)) else list(board)
+    except (TypeError, IndexError, KeyError):
+        raise ValueError(f"Bàn cờ không hợp lệ: {board!r}") from None
+    if len(flat) != 9:
+        raise ValueError(f"Bàn cờ phải có 9 ô, nhận được {len(flat)}")
+    if any(type(cell) is not int for cell in flat) or set(flat) != set(range(9)):
+        raise ValueError(f"Bàn cờ phải là hoán vị của 0..8, nhận được {flat}")
+    return ''.join(str(cell) if cell != 0 else '_' for cell in flat)
+
+
+def to_board(state):
+    cells = [0 if tile == '_' else int(tile) for tile in state]
+    return [cells[i:i + 3] for i in range(0, 9, 3)]
+
+
+def read_boards(path):
+    """
+    Sinh ra (id, board) từ file .jsonl hoặc .csv.
+    JSONL: mỗi dòng là list (3x3 hoặc 9 số) hoặc object {"id": ..., "board": ...}.
+    CSV: mỗi dòng 9 số (dòng đầu không phải số được coi là tiêu đề),
+    hoặc một cột chuỗi 9 ký tự như '12345678_'.
+    Dòng không đọc được vẫn được sinh ra (board là dữ liệu thô hoặc None) để
+    solve_batch ghi bản ghi lỗi cho đúng dòng đó.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            for i, row in enumerate(csv.reader(f)):
+                row = [cell.strip() for cell in row if cell.strip()]
+                if not row:
+                    continue
+                if len(row) == 1 and len(row[0]) == 9:
+                    row = list(row[0])
+                try:
+                    yield i, [0 if cell in ('_', '0') else int(cell) for cell in row]
+                except ValueError:
+                    if i > 0:
+                        yield i, row
+    else:
+        with open(path) as f:
+            for i, line in enumerate(f):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    yield i, None
+                    continue
+                if isinstance(item, dict):
+                    yield item.get('id', i), item.get('board')
+                else:
+                    yield i, item
+
+
+def solve_state(args):
+    """Chạy trong worker process: trả về danh sách action của lời giải tối ưu"""
+    state, solver = args
+    problem = EightPuzzle(to_board(state))
+    if solver == 'simpleai':
+        from simpleai.search import astar
+        result = astar(problem, graph_search=True)
+    else:
+        result = astar_packed(problem)
+    if result is None:
+        return None
+    return [action for action, _ in result.path()[1:]]
+
+
+def solve_chunk(states, solver):
+    """Một task của pool: giải lần lượt một nhóm state"""
+    return [solve_state((state, solver)) for state in states]
+
+
+def solve_batch(boards, workers=None, chunksize=16, cache_path=DEFAULT_CACHE,
+                solver='packed', window=1024, stats=None, ordered=False):
+    """
+    Giải hàng loạt bàn 8-puzzle, sinh ra từng kết quả ngay khi có.
+
+    - Bàn không hợp lệ (không phải hoán vị của 0..8) cho bản ghi có 'error'
+      thay vì làm dừng cả lô.
+    - is_solvable lọc trước các bàn không giải được (không tốn worker).
+    - Các bàn cần giải (bỏ trùng với bàn đang chờ giải) gửi cho
+      ProcessPoolExecutor theo task `chunksize` bàn. Tối đa `window` bản ghi
+      chưa được sinh ra; đủ thì chờ một task xong rồi mới đọc tiếp đầu vào.
+    - Mặc định kết quả ra theo thứ tự hoàn thành (ghép lại bằng 'id');
+      ordered=True giữ đúng thứ tự đầu vào, khi đó một bàn chậm giữ lại các
+      kết quả phía sau nó (tối đa window bản ghi).
+    - Cache lưu trên đĩa (shelve) theo chuỗi chuẩn của bàn; bàn đã gặp ở
+      các lần chạy trước được trả về ngay. cache_path=None để tắt cache.
+    """
+    stats = stats if stats is not None else {}
+    for key in ('boards', 'invalid', 'unsolvable', 'cache_hits', 'solved'):
+        stats.setdefault(key, 0)
+
+    cache = None
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        cache = shelve.open(cache_path)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from _stream(boards, pool, chunksize, cache, solver, max(1, window), ordered, stats)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _prepare(board_id, board, cache, stats):
+    """Bản ghi của một bàn; chưa có 'moves' nghĩa là còn phải giải"""
+    stats['boards'] += 1
+    try:
+        state = canonical(board)
+    except ValueError as e:
+        stats['invalid'] += 1
+        return {'id': board_id, 'board': None, 'solvable': None, 'cached': False,
+                'moves': None, 'length': None, 'error': str(e)}
+    record = {'id': board_id, 'board': state, 'solvable': True, 'cached': False}
+    if not is_solvable(to_board(state)):
+        stats['unsolvable'] += 1
+        record.update(solvable=False, moves=None, length=None)
+    elif cache is not None and state in cache:
+        stats['cache_hits'] += 1
+        moves = cache[state]
+        record.update(cached=True, moves=moves, length=len(moves))
+    return record
+
+
+def _stream(boards, pool, chunksize, cache, solver, window, ordered, stats):
+    waiting = {}   # state -> [(seq, bản ghi)] đang chờ lời giải của state đó
+    running = {}   # future -> các state của task
+    chunk = []     # state chưa gửi cho pool
+    ready = {}     # ordered: seq -> bản ghi đã xong nhưng chưa tới lượt
+    count = emitted = 0
+
+    def submit():
+        if chunk:
+            running[pool.submit(solve_chunk, list(chunk), solver)] = list(chunk)
+            chunk.clear()
+
+    def collect(block):
+        """(seq, bản ghi) của các task đã xong; block=True thì chờ ít nhất một task"""
+        done = wait(running, return_when=FIRST_COMPLETED).done if block else [f for f in running if f.done()]
+        finished = []
+        for future in done:
+            for state, moves in zip(running.pop(future), future.result()):
+                if moves is not None:
+                    stats['solved'] += 1
+                    if cache is not None:
+                        cache[state] = moves
+                for seq, record in waiting.pop(state):
+                    if moves is None:
+                        record.update(moves=None, length=None, error="không tìm được lời giải")
+                    else:
+                        record.update(moves=moves, length=len(moves))
+                    finished.append((seq, record))
+        return finished
+
+    def release(items):
+        if not ordered:
+            return [record for _, record in items]
+        ready.update(items)
+        out = []
+        while emitted + len(out) in ready:
+            out.append(ready.pop(emitted + len(out)))
+        return out
+
+    for board_id, board in boards:
+        record = _prepare(board_id, board, cache, stats)
+        items = []
+        if 'moves' in record:
+            items.append((count, record))
+        else:
+            state = record['board']
+            if state not in waiting:
+                waiting[state] = []
+                chunk.append(state)
+                if len(chunk) >= chunksize:
+                    submit()
+            waiting[state].append((count, record))
+        count += 1
+        if running:
+            items += collect(block=False)
+        for record in release(items):
+            emitted += 1
+            yield record
+        while count - emitted >= window:
+            submit()
+            if not running:
+                break
+            for record in release(collect(block=True)):
+                emitted += 1
+                yield record
+
+    submit()
+    while running:
+        for record in release(collect(block=True)):
+            emitted += 1
+            yield record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Giải hàng loạt 8-puzzle từ file JSONL/CSV")
+    parser.add_argument('input', help="file .jsonl hoặc .csv")
+    parser.add_argument('-o', '--output', help="file JSONL kết quả (mặc định: stdout)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=16)
+    parser.add_argument('--window', type=int, default=1024)
+    parser.add_argument('--cache', default=DEFAULT_CACHE)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--solver', choices=['packed', 'simpleai'], default='packed')
+    parser.add_argument('--ordered', action='store_true', help="ghi kết quả theo đúng thứ tự đầu vào")
+    args = parser.parse_args(argv)
+
+    stats = {}
+    start = time.perf_counter()
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for record in solve_batch(read_boards(args.input), args.workers, args.chunksize,
+                                  None if args.no_cache else args.cache,
+                                  args.solver, args.window, stats, args.ordered):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    stats['seconds'] = round(time.perf_counter() - start, 3)
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
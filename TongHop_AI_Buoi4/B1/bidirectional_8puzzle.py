@@ -0,0 +1,230 @@
+import heapq
+from itertools import count
+
+from astar_8puzzle import GOAL
+from astar_bitpacked_8puzzle import OPPOSITE, build_node
+from puzzle_heuristics import manhattan_table, manhattan
+from pattern_db import PatternDatabase
+
+
+def _goal_of(problem, goal):
+    return goal if goal is not None else getattr(problem, 'goal', GOAL)
+
+
+def _join(forward, backward, meet, start):
+    """Ghép đường start -> meet (phía forward) với meet -> goal (phía backward)"""
+    # Nửa đầu: lần ngược từ meet về start
+    states, actions = [], []
+    state = meet
+    while forward[state] is not None:
+        prev, action = forward[state]
+        states.append(state)
+        actions.append(action)
+        state = prev
+    states.append(start)
+    actions.append(None)
+    states.reverse()
+    actions.reverse()
+
+    # Nửa sau: đi từ meet tới goal bằng action ngược của phía backward
+    state = meet
+    while backward[state] is not None:
+        nxt, action = backward[state]
+        states.append(nxt)
+        actions.append(OPPOSITE[action])
+        state = nxt
+    return build_node(states, actions)
+
+
+def bidirectional_search(problem, goal=None, stats=None, deadline=None, pdb=None):
+    """
+    A* hai chiều (front-to-end): phía xuôi tìm từ initial_state với h tới
+    goal, phía ngược tìm từ goal với h tới initial_state; mỗi lượt mở rộng
+    một node của phía có open list nhỏ hơn.
+
+    h mặc định là Manhattan. pdb (PatternDatabase của goal, mặc định
+    problem.pdb nếu có): phía xuôi dùng pdb, phía ngược dùng một PDB cùng
+    nhóm tile build trong bộ nhớ cho initial_state (~0.2s với bàn 3x3).
+
+    mu là độ dài đường ngắn nhất đã thấy qua một state có g ở cả hai phía.
+    Mọi đường ngắn hơn phải đi qua một node còn trong open của mỗi phía,
+    nên khi mu <= max(f nhỏ nhất hai phía) thì mu tối ưu (Manhattan
+    admissible theo cả hai chiều).
+
+    Bản thân việc tìm hai chiều không giảm số node so với A* một chiều cùng
+    heuristic (hai phía gặp nhau muộn khi heuristic đã tốt); phần giảm đến
+    từ heuristic: với PDB, các bàn sâu (31 bước) mở rộng ít hơn 10-30 lần
+    so với A* Manhattan. Demo bên dưới in số node của từng cách.
+
+    Dùng problem.actions/result nên chạy được với EightPuzzle và
+    SlidingPuzzle; action phải đảo ngược được qua OPPOSITE.
+    Trả về node có path() giống simpleai, hoặc None nếu không giải được.
+    stats (dict, tùy chọn) nhận số node đã mở rộng và đã sinh.
+    deadline (common.deadline.Deadline hoặc object có expired()): hết hạn
+    thì trả về None.
+    """
+    goal = _goal_of(problem, goal)
+    stats = stats if stats is not None else {}
+    stats.update(expanded=0, generated=0)
+
+    start = problem.initial_state
+    width = getattr(problem, 'width', 3)
+    blank = '_' if isinstance(start, str) else 0
+    pdb = pdb if pdb is not None else getattr(problem, 'pdb', None)
+    if pdb is None:
+        fwd_dist, bwd_dist = manhattan_table(goal, width, blank), manhattan_table(start, width, blank)
+        fwd_h = lambda state: manhattan(state, fwd_dist)
+        bwd_h = lambda state: manhattan(state, bwd_dist)
+    else:
+        if tuple(pdb.goal) != tuple(goal):
+            raise ValueError("pdb phải được build cho đúng goal của bài toán")
+        fwd_h = pdb.heuristic
+        bwd_h = PatternDatabase(start, width, pdb.groups, directory=None, blank=blank).heuristic
+    tie = count()
+    # Mỗi phía: g, parent (state trước đó trong cùng phía, action đã đi),
+    # open list (f, h, tie, g, state) và heuristic tới đích của phía đó
+    forward = {'g': {start: 0}, 'parent': {start: None}, 'open': [], 'h': fwd_h}
+    backward = {'g': {goal: 0}, 'parent': {goal: None}, 'open': [], 'h': bwd_h}
+    for side, state in ((forward, start), (backward, goal)):
+        h = side['h'](state)
+        side['open'].append((h, h, next(tie), 0, state))
+
+    mu, meet = (0, start) if start == goal else (float('inf'), None)
+    while forward['open'] and backward['open']:
+        if mu <= max(forward['open'][0][0], backward['open'][0][0]):
+            break
+        if len(forward['open']) <= len(backward['open']):
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+
+        _, _, _, g, state = heapq.heappop(side['open'])
+        if g != side['g'][state]:
+            continue  # node cũ: đã có đường ngắn hơn
+        if deadline is not None and deadline.expired():
+            return None
+        stats['expanded'] += 1
+        for action in problem.actions(state):
+            child = problem.result(state, action)
+            if g + 1 >= side['g'].get(child, g + 2):
+                continue
+            stats['generated'] += 1
+            side['g'][child] = g + 1
+            side['parent'][child] = (state, action)
+            h = side['h'](child)
+            heapq.heappush(side['open'], (g + 1 + h, h, next(tie), g + 1, child))
+            if child in other['g'] and g + 1 + other['g'][child] < mu:
+                mu, meet = g + 1 + other['g'][child], child
+
+    if meet is None:
+        return None
+    return _join(forward['parent'], backward['parent'], meet, start)
+
+
+def bidirectional_bfs(problem, goal=None, stats=None, deadline=None):
+    """
+    BFS hai chiều: một phía loang từ initial_state, phía kia loang ngược từ
+    goal, mỗi lượt mở rộng trọn một lớp của phía có frontier nhỏ hơn.
+    Không dùng heuristic nên mở rộng nhiều node hơn A*; giữ lại để so sánh.
+
+    Dừng ngay khi một state con đã có trong phía bên kia: nếu tồn tại đường
+    dài <= df + db thì hai phía đã gặp nhau từ lớp trước, nên lần gặp đầu
+    tiên trong lớp df + 1 luôn cho đường tối ưu df + 1 + db.
+    Tham số và kết quả giống bidirectional_search.
+    """
+    goal = _goal_of(problem, goal)
+    stats = stats if stats is not None else {}
+    stats.update(expanded=0, generated=0)
+
+    start = problem.initial_state
+    # parent[state] = (state trước đó trong cùng phía, action đã đi)
+    forward = {start: None}
+    backward = {goal: None}
+    fwd_frontier, bwd_frontier = [start], [goal]
+
+    meet = start if start == goal else None
+    while meet is None and fwd_frontier and bwd_frontier:
+        if len(fwd_frontier) <= len(bwd_frontier):
+            frontier, seen, other = fwd_frontier, forward, backward
+        else:
+            frontier, seen, other = bwd_frontier, backward, forward
+
+        next_frontier = []
+        for state in frontier:
+            if deadline is not None and deadline.expired():
+                return None
+            stats['expanded'] += 1
+            for action in problem.actions(state):
+                child = problem.result(state, action)
+                if child in seen:
+                    continue
+                stats['generated'] += 1
+                seen[child] = (state, action)
+                if child in other:
+                    meet = child
+                    break
+                next_frontier.append(child)
+            if meet is not None:
+                break
+
+        if seen is forward:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
+
+    if meet is None:
+        return None
+    return _join(forward, backward, meet, start)
+
+
+if __name__ == '__main__':
+    import time
+    from simpleai.search import astar
+    from astar_8puzzle import EightPuzzle, print_board
+
+    class CountingPuzzle(EightPuzzle):
+        """Đếm số node astar mở rộng (mỗi lần mở rộng gọi actions một lần)"""
+        expanded = 0
+
+        def actions(self, state):
+            self.expanded += 1
+            return super().actions(state)
+
+    board = [
+        [8, 6, 7],
+        [2, 5, 4],
+        [3, 0, 1]
+    ]
+    problem = CountingPuzzle(board)
+    print("Trạng thái ban đầu:")
+    print_board(problem.initial_state)
+
+    # So sánh theo số node mở rộng; thời gian của astar chủ yếu là chi phí node của simpleai
+    start = time.perf_counter()
+    result = astar(problem, graph_search=True)
+    print(f"{'A*':13}: {len(result.path()) - 1} bước, "
+          f"{problem.expanded} node mở rộng, {time.perf_counter() - start:.2f}s")
+
+    for name, search in (("A* hai chiều", bidirectional_search), ("BFS hai chiều", bidirectional_bfs)):
+        stats = {}
+        start = time.perf_counter()
+        result = search(EightPuzzle(board), stats=stats)
+        print(f"{name:13}: {len(result.path()) - 1} bước, "
+              f"{stats['expanded']} node mở rộng, {time.perf_counter() - start:.2f}s")
+    print_board(result.state)
+
+    # Cùng so sánh với heuristic PDB: số node giảm nhờ heuristic, không nhờ tìm hai chiều
+    from astar_8puzzle import GOAL
+    from pattern_db import PatternDatabase
+
+    with PatternDatabase(GOAL) as pdb:
+        problem = CountingPuzzle(board, pdb=pdb)
+        start = time.perf_counter()
+        result = astar(problem, graph_search=True)
+        print(f"{'A* PDB':18}: {len(result.path()) - 1} bước, "
+              f"{problem.expanded} node mở rộng, {time.perf_counter() - start:.2f}s")
+        stats = {}
+        start = time.perf_counter()
+        result = bidirectional_search(EightPuzzle(board, pdb=pdb), stats=stats)
+        print(f"{'A* hai chiều PDB':18}: {len(result.path()) - 1} bước, "
+              f"{stats['expanded']} node mở rộng, {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,138 @@
+import mmap
+import os
+from collections import deque
+
+from astar_bitpacked_8puzzle import OFFSETS, build_node
+from pattern_db import DEFAULT_DIR, write_pattern
+
+UNREACHED = 255
+FACTORIALS = [1, 1, 2, 6, 24, 120, 720, 5040, 40320]
+CODE = {tile: i for i, tile in enumerate('_12345678')}
+
+# Action hợp lệ theo vị trí ô trống, cùng thứ tự với EightPuzzle.actions
+ACTIONS = []
+for _b in range(9):
+    _acts = []
+    if _b % 3 > 0: _acts.append('LEFT')
+    if _b % 3 < 2: _acts.append('RIGHT')
+    if _b // 3 > 0: _acts.append('UP')
+    if _b // 3 < 2: _acts.append('DOWN')
+    ACTIONS.append(_acts)
+
+
+def rank(state):
+    """
+    Thứ hạng Lehmer của hoán vị 9 ô trong [0, 9!).
+    seen là bitmask các mã tile đã duyệt, nên số tile nhỏ hơn còn lại
+    bằng mã tile trừ đi số bit đã dùng bên dưới nó.
+    """
+    r = 0
+    seen = 0
+    for i in range(8):
+        c = CODE[state[i]]
+        r += (c - (seen & ((1 << c) - 1)).bit_count()) * FACTORIALS[8 - i]
+        seen |= 1 << c
+    return r
+
+
+def move(state, idx, action):
+    swap = idx + OFFSETS[action]
+    l = list(state)
+    l[idx], l[swap] = l[swap], l[idx]
+    return ''.join(l), swap
+
+
+def build_table(goal):
+    """
+    BFS ngược một lần từ goal qua toàn bộ 181440 trạng thái giải được.
+    Kết quả: bytearray 9! phần tử, table[rank(s)] = số bước tối ưu từ s tới goal
+    (255 cho các hoán vị không giải được).
+    """
+    table = bytearray([UNREACHED]) * FACTORIALS[8] * 9
+    table[rank(goal)] = 0
+    queue = deque([(goal, goal.index('_'))])
+    while queue:
+        state, idx = queue.popleft()
+        d = table[rank(state)] + 1
+        for action in ACTIONS[idx]:
+            child, swap = move(state, idx, action)
+            r = rank(child)
+            if table[r] == UNREACHED:
+                table[r] = d
+                queue.append((child, swap))
+    return table
+
+
+def table_path(goal, directory=DEFAULT_DIR):
+    return os.path.join(directory, f'dist_3x3_{goal}.bin')
+
+
+class DistanceTable:
+    """
+    Bảng khoảng cách tối ưu của mọi trạng thái 3x3, nạp bằng mmap.
+    Giải = đi tham lam xuống theo gradient khoảng cách, không cần tìm kiếm.
+    """
+
+    def __init__(self, goal, directory=DEFAULT_DIR):
+        self.goal = goal
+        path = table_path(goal, directory)
+        if not os.path.exists(path):
+            write_pattern(path, build_table(goal))
+        self._file = open(path, 'rb')
+        self.table = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def distance(self, state):
+        """Số bước tối ưu, hoặc None nếu không giải được"""
+        d = self.table[rank(state)]
+        return None if d == UNREACHED else d
+
+    def solve(self, state):
+        """Trả về node có path() giống simpleai, hoặc None nếu không giải được"""
+        d = self.distance(state)
+        if d is None:
+            return None
+        states, actions = [state], [None]
+        idx = state.index('_')
+        while d > 0:
+            for action in ACTIONS[idx]:
+                child, swap = move(state, idx, action)
+                if self.table[rank(child)] == d - 1:
+                    break
+            state, idx, d = child, swap, d - 1
+            states.append(state)
+            actions.append(action)
+        return build_node(states, actions)
+
+    def close(self):
+        self.table.close()
+        self._file.close()
+
+
+_loaded = {}
+
+
+def get_table(goal):
+    """Mỗi process chỉ mở bảng của một goal một lần"""
+    if goal not in _loaded:
+        _loaded[goal] = DistanceTable(goal)
+    return _loaded[goal]
+
+
+if __name__ == '__main__':
+    import time
+    from astar_8puzzle import EightPuzzle, GOAL, table_search
+
+    start = time.perf_counter()
+    table = get_table(GOAL)
+    print(f"Nạp bảng khoảng cách: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    board = [
+        [8, 6, 7],
+        [2, 5, 4],
+        [3, 0, 1]
+    ]
+    problem = EightPuzzle(board)
+    start = time.perf_counter()
+    result = table_search(problem)
+    elapsed = time.perf_counter() - start
+    print(f"Số bước: {len(result.path()) - 1}, thời gian: {elapsed * 1e6:.0f} µs")
@@ -1,59 +1,84 @@
-from simpleai.search import SearchProblem, greedy
-
-GOAL = '12345678_'
-
-class EightPuzzle(SearchProblem):
-    def __init__(self, board2d):
-        super().__init__(self.board_to_str(board2d))
-    def board_to_str(self, board):
-        return ''.join(str(cell) if cell != 0 else '_' for row in board for cell in row)
-    def actions(self, state):
-        idx = state.index('_')
-        acts = []
-        if idx % 3 > 0: acts.append('LEFT')
-        if idx % 3 < 2: acts.append('RIGHT')
-        if idx // 3 > 0: acts.append('UP')
-        if idx // 3 < 2: acts.append('DOWN')
-        return acts
-    def result(self, state, action):
-        idx = state.index('_')
-        swap = idx + {'LEFT': -1, 'RIGHT': 1, 'UP': -3, 'DOWN': 3}[action]
-        l = list(state)
-        l[idx], l[swap] = l[swap], l[idx]
-        return ''.join(l)
-    def is_goal(self, state):
-        return state == GOAL
-    def heuristic(self, state):
-        return sum(
-            abs(i//3 - GOAL.index(tile)//3) + abs(i%3 - GOAL.index(tile)%3)
-            for i, tile in enumerate(state) if tile != '_'
-        )
-
-def is_solvable(board):
-    flat = [cell for row in board for cell in row if cell != 0]
-    inv = sum(flat[i] > flat[j] for i in range(len(flat)) for j in range(i+1, len(flat)))
-    return inv % 2 == 0
-
-def print_board(state):
-    for i in range(0, 9, 3):
-        print(' '.join(state[i:i+3]).replace('_', ' '))
-    print()
-
-if __name__ == '__main__':
-    board = [
-        [1, 2, 3],
-        [4, 0, 6],
-        [7, 5, 8]
-    ]
-    problem = EightPuzzle(board)
-    print("Trạng thái ban đầu:")
-    print_board(problem.initial_state)
-    if not is_solvable(board):
-        print("Không giải được!")
-    else:
-        print(f"Heuristic ban đầu: {problem.heuristic(problem.initial_state)}")
-        result = greedy(problem, graph_search=True)
-        for i, (action, state) in enumerate(result.path()):
-            print(f"Bước {i}: {'-> '+action if action else ''}")
-            print_board(state)
-            print(f"h={problem.heuristic(state)}\n")
+from simpleai.search import SearchProblem, greedy
+from puzzle_heuristics import manhattan_table, manhattan, move_delta
+
+GOAL = '12345678_'
+
+class EightPuzzle(SearchProblem):
+    def __init__(self, board2d, incremental=False, pdb=None, cache_size=65536):
+        """
+        incremental=True: h của mỗi state con = h của cha + thay đổi của
+        đúng một tile vừa di chuyển (move_delta). h được giữ trong cache tối
+        đa cache_size state, đầy thì bỏ state cũ nhất; state đã bị bỏ thì
+        tính lại từ bảng.
+        pdb: PatternDatabase (pattern_db.py) dùng thay cho Manhattan.
+        """
+        super().__init__(self.board_to_str(board2d))
+        self.dist = manhattan_table(GOAL)
+        self.incremental = incremental and pdb is None
+        self.pdb = pdb
+        self.cache_size = cache_size
+        self._h = {}
+    def _remember(self, state, h):
+        if len(self._h) >= self.cache_size:
+            del self._h[next(iter(self._h))]  # dict giữ thứ tự thêm vào: bỏ state cũ nhất
+        self._h[state] = h
+        return h
+    def board_to_str(self, board):
+        return ''.join(str(cell) if cell != 0 else '_' for row in board for cell in row)
+    def actions(self, state):
+        idx = state.index('_')
+        acts = []
+        if idx % 3 > 0: acts.append('LEFT')
+        if idx % 3 < 2: acts.append('RIGHT')
+        if idx // 3 > 0: acts.append('UP')
+        if idx // 3 < 2: acts.append('DOWN')
+        return acts
+    def result(self, state, action):
+        idx = state.index('_')
+        swap = idx + {'LEFT': -1, 'RIGHT': 1, 'UP': -3, 'DOWN': 3}[action]
+        l = list(state)
+        l[idx], l[swap] = l[swap], l[idx]
+        new_state = ''.join(l)
+        if self.incremental and new_state not in self._h:
+            self._remember(new_state, self.heuristic(state) + move_delta(self.dist, state[swap], swap, idx))
+        return new_state
+    def is_goal(self, state):
+        return state == GOAL
+    def heuristic(self, state):
+        if self.pdb is not None:
+            return self.pdb.heuristic(state)
+        if not self.incremental:
+            return manhattan(state, self.dist)
+        h = self._h.get(state)
+        if h is None:
+            h = self._remember(state, manhattan(state, self.dist))
+        return h
+
+def is_solvable(board):
+    flat = [cell for row in board for cell in row if cell != 0]
+    inv = sum(flat[i] > flat[j] for i in range(len(flat)) for j in range(i+1, len(flat)))
+    return inv % 2 == 0
+
+def print_board(state):
+    for i in range(0, 9, 3):
+        print(' '.join(state[i:i+3]).replace('_', ' '))
+    print()
+
+if __name__ == '__main__':
+    board = [
+        [1, 2, 3],
+        [4, 0, 6],
+        [7, 5, 8]
+    ]
+    problem = EightPuzzle(board)
+    print("Trạng thái ban đầu:")
+    print_board(problem.initial_state)
+    if not is_solvable(board):
+        print("Không giải được!")
+    else:
+        print(f"Heuristic ban đầu: {problem.heuristic(problem.initial_state)}")
+        result = greedy(problem, graph_search=True)
+        for i, (action, state) in enumerate(result.path()):
+            print(f"Bước {i}: {'-> '+action if action else ''}")
+            print_board(state)
+            print(f"h={problem.heuristic(state)}\n")
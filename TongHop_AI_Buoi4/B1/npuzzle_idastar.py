@@ -0,0 +1,204 @@
+from simpleai.search import SearchProblem
+from puzzle_heuristics import manhattan_table, manhattan
+from astar_bitpacked_8puzzle import OPPOSITE, build_node
+
+INF = float('inf')
+
+
+def make_goal(width):
+    """Goal chuẩn cho bàn width x width: 1, 2, ..., N*N-1 rồi ô trống (0)"""
+    return tuple(range(1, width * width)) + (0,)
+
+
+def make_moves(width):
+    """moves[b] = [(action, s), ...]: ô trống ở b đi sang ô s"""
+    moves = []
+    for b in range(width * width):
+        acts = []
+        if b % width > 0: acts.append(('LEFT', b - 1))
+        if b % width < width - 1: acts.append(('RIGHT', b + 1))
+        if b // width > 0: acts.append(('UP', b - width))
+        if b // width < width - 1: acts.append(('DOWN', b + width))
+        moves.append(acts)
+    return moves
+
+
+class SlidingPuzzle(SearchProblem):
+    """
+    Bài toán trượt ô NxN (8-puzzle, 15-puzzle, 24-puzzle, ...).
+    State: tuple N*N số nguyên theo hàng, ô trống = 0.
+    Action giống EightPuzzle: hướng di chuyển của ô trống.
+    """
+
+    def __init__(self, board2d, goal=None, pdb=None):
+        self.width = len(board2d)
+        self.goal = goal or make_goal(self.width)
+        self.moves = make_moves(self.width)
+        self.dist = manhattan_table(self.goal, self.width, blank=0)
+        self.pdb = pdb
+        super().__init__(tuple(cell for row in board2d for cell in row))
+
+    def actions(self, state):
+        return [action for action, _ in self.moves[state.index(0)]]
+
+    def result(self, state, action):
+        idx = state.index(0)
+        swap = dict(self.moves[idx])[action]
+        l = list(state)
+        l[idx], l[swap] = l[swap], l[idx]
+        return tuple(l)
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def cost(self, a, b, c):
+        return 1
+
+    def heuristic(self, state):
+        if self.pdb is not None:
+            return self.pdb.heuristic(state)
+        return manhattan(state, self.dist)
+
+
+def is_solvable(board, goal=None):
+    """
+    Đúng cho mọi kích thước bàn: giải được khi và chỉ khi tính chẵn lẻ của
+    hoán vị (tính cả ô trống) từ board sang goal bằng tính chẵn lẻ của
+    khoảng cách Manhattan giữa vị trí ô trống ở board và ở goal.
+    Với bàn rộng lẻ điều này trùng với luật "số nghịch thế chẵn";
+    với bàn rộng chẵn nó tự tính thêm hàng của ô trống.
+    """
+    width = len(board)
+    flat = [cell for row in board for cell in row]
+    goal = goal or make_goal(width)
+    where = {tile: i for i, tile in enumerate(goal)}
+    perm = [where[tile] for tile in flat]
+
+    # Chẵn lẻ của hoán vị qua phân rã chu trình: mỗi chu trình dài L góp L-1
+    seen = [False] * len(perm)
+    transpositions = 0
+    for i in range(len(perm)):
+        length = 0
+        while not seen[i]:
+            seen[i] = True
+            i = perm[i]
+            length += 1
+        if length:
+            transpositions += length - 1
+
+    b, g = flat.index(0), goal.index(0)
+    blank_dist = abs(b // width - g // width) + abs(b % width - g % width)
+    return transpositions % 2 == blank_dist % 2
+
+
+def print_board(state, width=None):
+    width = width or int(len(state) ** 0.5)
+    pad = len(str(len(state) - 1))
+    for i in range(0, len(state), width):
+        print(' '.join(str(t).rjust(pad) if t else ' ' * pad for t in state[i:i + width]))
+    print()
+
+
+def ida_star(problem, deadline=None):
+    """
+    IDA*: tìm kiếm sâu dần theo ngưỡng f = g + h.
+
+    - Bộ nhớ O(độ sâu): chỉ giữ một bàn cờ (list, sửa tại chỗ) và danh sách action.
+    - Không sinh lại node cha: bỏ qua action ngược với action vừa đi.
+    - Sắp xếp con theo h tăng dần để tới goal sớm ở vòng lặp cuối.
+    - h cập nhật tăng dần theo tile vừa di chuyển (Manhattan), hoặc tra PDB
+      nếu problem.pdb được đặt.
+
+    Trả về node có path() giống simpleai. IDA* không tự phát hiện bàn không
+    giải được (không gian trạng thái không có đáy), nên cần gọi is_solvable trước.
+    deadline (common.deadline.Deadline hoặc object có expired()): hết hạn
+    thì trả về None.
+    """
+    board = list(problem.initial_state)
+    goal = list(problem.goal)
+    moves = problem.moves
+    dist = problem.dist
+    pdb = problem.pdb
+    actions = []
+    found = []
+
+    def search(b, g, h, bound, prev):
+        f = g + h
+        if f > bound:
+            return f
+        if deadline is not None and deadline.expired():
+            return INF  # cắt hết các nhánh còn lại
+        if h == 0 and board == goal:
+            found.append(True)
+            return f
+
+        back = OPPOSITE.get(prev)
+        children = []
+        for action, s in moves[b]:
+            if action == back:
+                continue
+            tile = board[s]
+            if pdb is None:
+                ch = h + dist[tile][b] - dist[tile][s]
+            else:
+                board[b], board[s] = tile, 0
+                ch = pdb.heuristic(board)
+                board[s], board[b] = tile, 0
+            children.append((ch, action, s))
+        children.sort()
+
+        minimum = INF
+        for ch, action, s in children:
+            tile = board[s]
+            board[b], board[s] = tile, 0
+            actions.append(action)
+            t = search(s, g + 1, ch, bound, action)
+            if found:
+                return t
+            actions.pop()
+            board[s], board[b] = tile, 0
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    h = problem.heuristic(problem.initial_state)
+    bound = h
+    while True:
+        t = search(board.index(0), 0, h, bound, None)
+        if found:
+            break
+        if deadline is not None and deadline.expired():
+            return None
+        bound = t
+
+    states = [problem.initial_state]
+    for action in actions:
+        states.append(problem.result(states[-1], action))
+    return build_node(states, [None] + actions)
+
+
+if __name__ == '__main__':
+    import time
+
+    # 15-puzzle, 34 bước
+    board = [
+        [5, 3, 10, 2],
+        [1, 11, 6, 4],
+        [13, 9, 0, 7],
+        [14, 15, 12, 8]
+    ]
+    problem = SlidingPuzzle(board)
+    print("Trạng thái ban đầu:")
+    print_board(problem.initial_state)
+    if not is_solvable(board):
+        print("Không giải được!")
+    else:
+        print(f"h(n)={problem.heuristic(problem.initial_state)}")
+        start = time.perf_counter()
+        result = ida_star(problem)
+        elapsed = time.perf_counter() - start
+        path = result.path()
+        print(f"Số bước: {len(path) - 1}, thời gian: {elapsed:.2f}s")
+        print("Các action:", ' '.join(action for action, _ in path[1:]))
+        print("Trạng thái cuối:")
+        print_board(result.state)
@@ -0,0 +1,162 @@
+import mmap
+import os
+import zlib
+from collections import deque
+
+# Ô chưa tới được trong bảng (không xảy ra với nhóm tile hợp lệ)
+UNREACHED = 255
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb')
+
+
+def default_groups(goal, blank='_'):
+    """
+    Chia các tile (trừ ô trống) thành các nhóm rời nhau theo thứ tự trong goal.
+    3x3: 2 nhóm 4 tile; 4x4: 3 nhóm 5 tile.
+    """
+    tiles = [t for t in goal if t != blank]
+    k = 4 if len(goal) <= 9 else 5
+    return [tuple(tiles[i:i + k]) for i in range(0, len(tiles), k)]
+
+
+def _neighbors(width, size):
+    nbs = []
+    for p in range(size):
+        row, col = divmod(p, width)
+        cells = []
+        if col > 0: cells.append(p - 1)
+        if col < width - 1: cells.append(p + 1)
+        if row > 0: cells.append(p - width)
+        if row < width - 1: cells.append(p + width)
+        nbs.append(cells)
+    return nbs
+
+
+def build_pattern(goal, width, group, blank='_'):
+    """
+    BFS ngược từ goal trên không gian trừu tượng chỉ gồm các tile của group
+    và ô trống. Chỉ bước di chuyển tile trong group mới tốn chi phí 1, bước
+    đẩy tile ngoài nhóm tốn 0 (0-1 BFS), nhờ vậy tổng các nhóm rời nhau vẫn
+    là heuristic chấp nhận được (additive PDB).
+
+    Trả về bytearray độ dài size**k, chỉ số = sum(pos_i * size**i).
+    """
+    size = len(goal)
+    k = len(group)
+    weights = [size ** i for i in range(k)]
+    nbs = _neighbors(width, size)
+
+    table = bytearray([UNREACHED]) * (size ** k)
+    visited = bytearray(size ** k * size)
+
+    start = tuple(goal.index(t) for t in group)
+    queue = deque([(start, goal.index(blank), 0)])
+    while queue:
+        positions, b, cost = queue.popleft()
+        idx = sum(p * w for p, w in zip(positions, weights))
+        key = idx * size + b
+        if visited[key]:
+            continue
+        visited[key] = 1
+        if table[idx] == UNREACHED:
+            table[idx] = cost
+
+        for nb in nbs[b]:
+            if nb in positions:
+                # Tile của nhóm trượt vào chỗ trống: tốn 1 bước
+                moved = tuple(b if p == nb else p for p in positions)
+                queue.append((moved, nb, cost + 1))
+            else:
+                queue.appendleft((positions, nb, cost))
+    return table
+
+
+def pattern_path(goal, width, group, directory=DEFAULT_DIR):
+    tag = zlib.crc32(repr(tuple(goal)).encode())
+    tiles = '-'.join(str(t) for t in group)
+    return os.path.join(directory, f'pdb_{width}x{width}_{tag:08x}_{tiles}.bin')
+
+
+def write_pattern(path, table):
+    """Ghi ra file tạm rồi đổi tên, để tiến trình khác không đọc phải file dở"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(table)
+    os.replace(tmp, path)
+
+
+class PatternDatabase:
+    """
+    Heuristic additive PDB: tổng giá trị các nhóm tile rời nhau.
+
+    Mỗi nhóm được build một lần rồi lưu thành file byte; các lần sau chỉ
+    mmap file (chỉ đọc), nên khởi động gần như tức thì và các worker process
+    dùng chung trang nhớ của hệ điều hành. directory=None: build trong bộ
+    nhớ, không ghi file (cho goal dùng một lần, ví dụ phía ngược của
+    bidirectional_search).
+    """
+
+    def __init__(self, goal, width=3, groups=None, directory=DEFAULT_DIR, blank='_'):
+        self.goal = goal
+        self.width = width
+        self.groups = [tuple(g) for g in (groups or default_groups(goal, blank))]
+        size = len(goal)
+        self.weights = [[size ** i for i in range(len(g))] for g in self.groups]
+        self._files = []
+        self.tables = []
+        for group in self.groups:
+            if directory is None:
+                self.tables.append(build_pattern(goal, width, group, blank))
+                continue
+            path = pattern_path(goal, width, group, directory)
+            if not os.path.exists(path):
+                write_pattern(path, build_pattern(goal, width, group, blank))
+            f = open(path, 'rb')
+            self._files.append(f)
+            self.tables.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def heuristic(self, state):
+        pos = {tile: i for i, tile in enumerate(state)}
+        return sum(
+            table[sum(pos[t] * w for t, w in zip(group, weights))]
+            for group, weights, table in zip(self.groups, self.weights, self.tables)
+        )
+
+    def close(self):
+        for table in self.tables:
+            if isinstance(table, mmap.mmap):
+                table.close()
+        for f in self._files:
+            f.close()
+        self.tables, self._files = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    import time
+    from simpleai.search import astar
+    from astar_8puzzle import EightPuzzle, GOAL, print_board
+
+    start = time.perf_counter()
+    pdb = PatternDatabase(GOAL)
+    print(f"Nạp PDB {pdb.groups}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    board = [
+        [8, 6, 7],
+        [2, 5, 4],
+        [3, 0, 1]
+    ]
+    for name, problem in [('Manhattan', EightPuzzle(board)), ('PDB', EightPuzzle(board, pdb=pdb))]:
+        start = time.perf_counter()
+        result = astar(problem, graph_search=True)
+        elapsed = time.perf_counter() - start
+        print(f"{name:10}: h0={problem.heuristic(problem.initial_state)}, "
+              f"số bước={len(result.path()) - 1}, thời gian={elapsed:.2f}s")
+    print_board(result.state)
+    pdb.close()
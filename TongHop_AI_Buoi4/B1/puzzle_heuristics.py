@@ -0,0 +1,25 @@
+def manhattan_table(goal, width=3, blank='_'):
+    """
+    Bảng khoảng cách tính sẵn: table[tile][pos] = khoảng cách Manhattan
+    từ vị trí pos tới vị trí của tile trong goal.
+    Ô trống có hàng toàn 0 để khỏi phải kiểm tra riêng khi cộng dồn.
+    goal có thể là chuỗi ('12345678_') hoặc tuple số (ô trống = 0) cho bàn NxN.
+    """
+    size = len(goal)
+    table = {}
+    for g, tile in enumerate(goal):
+        table[tile] = [
+            0 if tile == blank else abs(p // width - g // width) + abs(p % width - g % width)
+            for p in range(size)
+        ]
+    return table
+
+
+def manhattan(state, table):
+    """Tổng khoảng cách Manhattan của cả bàn, tra bảng thay vì GOAL.index"""
+    return sum(table[tile][i] for i, tile in enumerate(state))
+
+
+def move_delta(table, tile, src, dst):
+    """Độ thay đổi của h khi tile đi từ src sang dst (ô trống đi ngược lại)"""
+    return table[tile][dst] - table[tile][src]
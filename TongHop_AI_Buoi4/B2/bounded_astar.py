@@ -0,0 +1,194 @@
+import os
+import sys
+import heapq
+import time
+import tracemalloc
+from itertools import count
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.memo import state_key
+from common.deadline import NO_DEADLINE
+
+
+class ResultNode:
+    """
+    Node kết quả có state, action, parent, cost, depth và path() giống
+    SearchNode của simpleai, để dùng thay kết quả của astar/greedy.
+    """
+    __slots__ = ('state', 'action', 'parent', 'cost', 'depth')
+
+    def __init__(self, state, action=None, parent=None, cost=0, depth=0):
+        self.state = state
+        self.action = action
+        self.parent = parent
+        self.cost = cost
+        self.depth = depth
+
+    def path(self):
+        node = self
+        path = []
+        while node:
+            path.append((node.action, node.state))
+            node = node.parent
+        return list(reversed(path))
+
+    def __repr__(self):
+        return f'Node <{self.state}>'
+
+
+def _replay(problem, actions):
+    """Dựng lại đường đi từ initial_state bằng chuỗi action"""
+    state = problem.initial_state
+    node = ResultNode(state)
+    for depth, action in enumerate(actions, 1):
+        state = problem.result(state, action)
+        node = ResultNode(state, action, node, depth, depth)
+    return node
+
+
+def bounded_astar(problem, frontier_cap=10000, greedy=False, weight=1,
+                  max_expanded=None, max_table=500000, trace_memory=False, stats=None, deadline=None):
+    """
+    A* (hoặc greedy best-first khi greedy=True) với frontier có giới hạn,
+    kiểu beam-A*: khi frontier vượt frontier_cap thì chỉ giữ lại 3/4 số node
+    có f nhỏ nhất, các node bị cắt cũng bị xóa khỏi bảng nên có thể được
+    sinh lại sau này. Node đã từng mở rộng không bao giờ bị xóa vì chúng là
+    tổ tiên của mọi node trong frontier, nhờ vậy đường đi luôn dựng lại được.
+
+    Bảng chuyển vị (transposition table) khóa theo state_key (bytes), lưu
+    (g, khóa cha, action); đường đi được dựng lại bằng cách chạy lại các
+    action từ initial_state, nên bảng không phải giữ state. Bảng giữ cả các
+    node đã mở rộng nên được giới hạn bởi max_table (None = không giới hạn).
+
+    f = g + weight * h (A*), hoặc f = h (greedy); mỗi bước đi tốn 1.
+    Dùng problem.actions/result/heuristic/is_goal như simpleai.
+
+    Trả về node có path() như simpleai, hoặc None nếu hết frontier, vượt
+    max_expanded hoặc bảng vượt max_table. Khi deadline (common.deadline) hết hạn thì trả về
+    node có h nhỏ nhất đã mở rộng (chưa chắc là goal, xem
+    deadline.timed_out). stats (dict, tùy chọn) nhận expanded, generated,
+    pruned, peak_frontier, table_size, seconds và peak_memory (byte, khi
+    trace_memory=True; tracemalloc làm chậm đáng kể).
+    """
+    deadline = deadline or NO_DEADLINE
+    stats = stats if stats is not None else {}
+    stats.update(expanded=0, generated=0, pruned=0, peak_frontier=1,
+                 table_size=0, seconds=0.0, peak_memory=None)
+    keep = max(1, frontier_cap * 3 // 4)
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    tie = count()
+    root = problem.initial_state
+    root_key = state_key(root)
+    h = problem.heuristic(root)
+    # table[key] = [g, khóa cha, action, đã mở rộng với g này?, đã từng mở rộng?]
+    table = {root_key: [0, None, None, False, False]}
+    frontier = [(h if greedy else weight * h, h, next(tie), 0, root_key, root)]
+    goal_key = None
+    best_h, best_key = h, root_key  # node gần goal nhất đã mở rộng
+
+    try:
+        while frontier:
+            f, h, _, g, key, state = heapq.heappop(frontier)
+            entry = table.get(key)
+            if entry is None or entry[3] or entry[0] != g:
+                continue  # node cũ: đã mở rộng hoặc đã có đường ngắn hơn
+            if problem.is_goal(state):
+                goal_key = key
+                break
+            if deadline.expired():
+                goal_key = best_key
+                break
+            entry[3] = entry[4] = True
+            if h < best_h:
+                best_h, best_key = h, key
+            stats['expanded'] += 1
+            if max_expanded is not None and stats['expanded'] > max_expanded:
+                break
+
+            for action in problem.actions(state):
+                child = problem.result(state, action)
+                child_key = state_key(child)
+                old = table.get(child_key)
+                if old is not None and old[0] <= g + 1:
+                    continue
+                ch = problem.heuristic(child)
+                # mở lại node đã mở rộng (tìm được đường ngắn hơn) vẫn giữ cờ tổ tiên
+                table[child_key] = [g + 1, key, action, False, old is not None and old[4]]
+                heapq.heappush(frontier, (ch if greedy else g + 1 + weight * ch,
+                                          ch, next(tie), g + 1, child_key, child))
+                stats['generated'] += 1
+
+            if len(frontier) > frontier_cap:
+                frontier.sort()
+                for item in frontier[keep:]:
+                    dropped = table.get(item[4])
+                    if dropped is not None and not dropped[4] and dropped[0] == item[3]:
+                        del table[item[4]]
+                stats['pruned'] += len(frontier) - keep
+                del frontier[keep:]  # danh sách đã sắp xếp vẫn là heap hợp lệ
+            stats['peak_frontier'] = max(stats['peak_frontier'], len(frontier))
+            if max_table is not None and len(table) > max_table:
+                break
+    finally:
+        stats['table_size'] = len(table)
+        stats['seconds'] = time.perf_counter() - start
+        if tracing:
+            stats['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    if goal_key is None:
+        return None
+    actions = []
+    key = goal_key
+    while table[key][1] is not None:
+        actions.append(table[key][2])
+        key = table[key][1]
+    actions.reverse()
+    return _replay(problem, actions)
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    import random
+    from xephau_heuristic import IncrementalQueensHeuristicProblem
+
+    random.seed(42)
+    for n in (8, 16, 32):
+        initial = tuple(random.randint(0, n - 1) for _ in range(n))
+        for name, greedy in (("A*", False), ("Greedy", True)):
+            print("=" * 60)
+            print(f"{name} GIỚI HẠN FRONTIER, n = {n}")
+            print("=" * 60)
+            problem = IncrementalQueensHeuristicProblem(initial)
+            stats = {}
+            result = bounded_astar(problem, frontier_cap=5000, greedy=greedy,
+                                   max_expanded=20000, trace_memory=True, stats=stats)
+            if result is None:
+                print("Không tìm được lời giải trong giới hạn")
+            else:
+                print(f"Kết quả: {result.state} ({len(result.path()) - 1} bước)")
+                print(f"Số cặp không xung đột: {problem.value(result.state)}/{problem.max_score}")
+            print(f"Mở rộng: {stats['expanded']}, sinh: {stats['generated']}, cắt: {stats['pruned']}, "
+                  f"frontier lớn nhất: {stats['peak_frontier']}, bảng: {stats['table_size']}")
+            print(f"Bộ nhớ đỉnh: {stats['peak_memory'] / 2 ** 20:.1f} MB, thời gian: {stats['seconds']:.2f}s")
+
+    # A* với deadline: n = 64 không kịp giải trong 0.5 giây, nhận node gần goal nhất
+    from common.deadline import Deadline
+
+    n = 64
+    problem = IncrementalQueensHeuristicProblem(tuple(random.randint(0, n - 1) for _ in range(n)))
+    deadline = Deadline(0.5)
+    stats = {}
+    result = bounded_astar(problem, frontier_cap=5000, deadline=deadline, stats=stats)
+    print("=" * 60)
+    print(f"A* VỚI DEADLINE 0.5s, n = {n}")
+    print("=" * 60)
+    print(f"Hết giờ: {deadline.timed_out}, mở rộng: {stats['expanded']}, thời gian: {stats['seconds']:.2f}s")
+    print(f"Số cặp tấn công: {problem.heuristic(problem.initial_state)} -> {problem.heuristic(result.state)} "
+          f"sau {len(result.path()) - 1} bước")
@@ -0,0 +1,266 @@
+import os
+import sys
+import random
+import time
+from multiprocessing import Barrier, Event, Process
+from threading import BrokenBarrierError
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.queens_eval import max_pairs
+from common.queens_batch import batch_values
+from common.deadline import Deadline
+
+
+# ------------------------
+# Bộ nhớ chung giữa các đảo
+# ------------------------
+def _layout(islands, population_size, n, migrants):
+    """Tên mảng -> (shape, dtype) trong cùng một khối SharedMemory"""
+    return [
+        ('population', (islands, population_size, n), np.int32),
+        ('fitness', (islands, population_size), np.int64),
+        ('migrants', (islands, migrants, n), np.int32),
+        ('migrant_fitness', (islands, migrants), np.int64),
+        ('solved', (islands,), np.int8),
+        ('timed_out', (islands,), np.int8),
+        ('generations', (islands,), np.int64),
+        ('evaluations', (islands,), np.int64),
+    ]
+
+
+def _attach(buf, layout):
+    arrays = {}
+    offset = 0
+    for name, shape, dtype in layout:
+        arr = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+        arrays[name] = arr
+        offset += arr.nbytes
+    return arrays
+
+
+def _size(layout):
+    return sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for _, shape, dtype in layout)
+
+
+# ------------------------
+# Một đảo
+# ------------------------
+def evolve(pop, fit, rng, mutation_rate):
+    """
+    Một thế hệ GA trên mảng NumPy, cùng quy tắc với genetic_algorithm:
+    giữ 10% tốt nhất, chọn cha mẹ trong nửa trên, lai một điểm, đột biến
+    một cột. Fitness của elite lấy từ bộ nhớ đệm, chỉ con mới được chấm điểm.
+    Trả về số lần đánh giá.
+    """
+    size, n = pop.shape
+    order = np.argsort(-fit, kind='stable')
+    pop[:] = pop[order]
+    fit[:] = fit[order]
+
+    elite = max(1, size // 10)
+    pool = max(2, size // 2)
+    count = size - elite
+    pairs = (count + 1) // 2
+
+    first = rng.integers(0, pool, pairs)
+    second = (first + rng.integers(1, pool, pairs)) % pool
+    points = rng.integers(1, max(2, n - 1), pairs)
+    before = np.arange(n)[None, :] < points[:, None]
+    p1, p2 = pop[first], pop[second]
+    children = np.concatenate([np.where(before, p1, p2), np.where(before, p2, p1)])[:count]
+
+    mutants = np.flatnonzero(rng.random(count) < mutation_rate)
+    children[mutants, rng.integers(0, n, len(mutants))] = rng.integers(0, n, len(mutants))
+
+    pop[elite:] = children
+    fit[elite:] = batch_values(children)
+    return count
+
+
+def _island(index, shm_name, layout, barrier, stop_event, seed, generations, interval, mutation_rate,
+            time_limit, barrier_timeout):
+    shm = SharedMemory(name=shm_name)
+    try:
+        arrays = _attach(shm.buf, layout)
+        pop = arrays['population'][index]
+        fit = arrays['fitness'][index]
+        migrants = arrays['migrants']
+        migrant_fitness = arrays['migrant_fitness']
+        solved = arrays['solved']
+        timed_out = arrays['timed_out']
+        islands, size, n = arrays['population'].shape
+        k = migrants.shape[1]
+        target = max_pairs(n)
+        rng = np.random.default_rng(seed)
+        deadline = Deadline(time_limit)  # đồng hồ riêng của process; cancel() của cha tới qua stop_event
+
+        pop[:] = rng.integers(0, n, (size, n))
+        fit[:] = batch_values(pop)
+        arrays['evaluations'][index] = size
+
+        done = 0
+        while done < generations:
+            for _ in range(min(interval, generations - done)):
+                if fit.max() == target or deadline.expired() or stop_event.is_set():
+                    break
+                arrays['evaluations'][index] += evolve(pop, fit, rng, mutation_rate)
+                done += 1
+                arrays['generations'][index] = done
+            if fit.max() == target:
+                solved[index] = 1
+            if deadline.timed_out or stop_event.is_set():
+                timed_out[index] = 1
+
+            # Di cư theo vòng: gửi k cá thể tốt nhất sang đảo kế tiếp,
+            # nhận k cá thể của đảo trước thay cho k cá thể kém nhất.
+            # Chỉ đọc cờ solved/timed_out giữa hai barrier nên mọi đảo cùng quyết định dừng.
+            best = np.argsort(-fit, kind='stable')[:k]
+            migrants[index] = pop[best]
+            migrant_fitness[index] = fit[best]
+            barrier.wait(barrier_timeout)
+            stop = bool(solved.any() or timed_out.any())
+            source = (index - 1) % islands
+            worst = np.argsort(fit, kind='stable')[:k]
+            pop[worst] = migrants[source]
+            fit[worst] = migrant_fitness[source]
+            barrier.wait(barrier_timeout)
+            if stop:
+                break
+    except BrokenBarrierError:
+        pass  # đảo khác lỗi, quá barrier_timeout hoặc cha đã abort: thoát, cha sẽ báo lỗi
+    except BaseException:
+        barrier.abort()  # để các đảo còn lại không chờ mãi ở barrier
+        raise
+    finally:
+        shm.close()
+
+
+def _join(workers, barrier, stop_event, deadline, join_timeout, poll=0.05):
+    """
+    Chờ các đảo: khi deadline hết hạn/bị hủy thì bật stop_event, khi có đảo
+    lỗi thì bật stop_event và abort barrier; từ lúc đó các đảo còn chạy quá
+    join_timeout giây bị terminate.
+    """
+    limit = None
+    while True:
+        alive = [w for w in workers if w.is_alive()]
+        if not alive:
+            return
+        alive[0].join(poll)
+        failed = any(w.exitcode not in (None, 0) for w in workers)
+        if failed and not barrier.broken:
+            barrier.abort()
+        if failed or (deadline is not None and deadline.expired()):
+            stop_event.set()
+            if limit is None:
+                limit = time.monotonic() + join_timeout
+        if limit is not None and time.monotonic() > limit:
+            for w in workers:
+                if w.is_alive():
+                    w.terminate()
+                    w.join()
+            return
+
+
+# ------------------------
+# Island-model GA
+# ------------------------
+def island_genetic_algorithm(problem, islands=None, population_size=100, generations=200,
+                             mutation_rate=0.1, migration_interval=10, migrants=2, stats=None, deadline=None,
+                             barrier_timeout=60.0, join_timeout=10.0):
+    """
+    GA mô hình đảo: mỗi đảo tiến hóa một quần thể riêng trong một process,
+    quần thể và fitness nằm trong SharedMemory. Cứ migration_interval thế hệ,
+    k = migrants cá thể tốt nhất di cư sang đảo kế tiếp theo vòng.
+
+    Trả về (best_state, best_score); stats (dict, tùy chọn) nhận số thế hệ,
+    số lần đánh giá của từng đảo và thời gian chạy. deadline (common.deadline):
+    mỗi đảo nhận số giây còn lại lúc khởi động; process cha theo dõi token
+    (kể cả cancel()) và báo cho các đảo qua một Event chung. Các đảo dừng ở
+    lần di cư kế tiếp.
+
+    Một đảo lỗi sẽ abort barrier nên các đảo khác thoát thay vì chờ mãi;
+    barrier_timeout (giây) chặn trường hợp một đảo treo. Sau khi đã yêu cầu
+    dừng, các đảo còn chạy quá join_timeout giây bị terminate. Đảo kết thúc
+    với exit code khác 0 hoặc barrier bị hỏng -> RuntimeError. Tham số không
+    hợp lệ (population_size < 2, migrants ngoài [0, population_size), ...)
+    -> ValueError trước khi tạo process nào.
+    """
+    islands = islands or os.cpu_count()
+    # Kiểm tra tham số ngay ở process cha: lỗi trong đảo chỉ hiện ra dưới dạng exit code
+    if islands < 1:
+        raise ValueError("islands phải >= 1")
+    if population_size < 2:
+        raise ValueError("population_size phải >= 2 (lai ghép cần hai cá thể)")
+    if not 0 <= migrants < population_size:
+        raise ValueError(f"migrants phải nằm trong [0, {population_size}) (population_size={population_size})")
+    if migration_interval < 1:
+        raise ValueError("migration_interval phải >= 1")
+    n = problem.n
+    layout = _layout(islands, population_size, n, migrants)
+    shm = SharedMemory(create=True, size=_size(layout))
+    start = time.perf_counter()
+    try:
+        arrays = _attach(shm.buf, layout)
+        arrays['solved'][:] = 0
+        arrays['timed_out'][:] = 0
+        time_limit = deadline.remaining() if deadline is not None else None
+        barrier = Barrier(islands)
+        stop_event = Event()
+        base = random.randrange(2 ** 32)
+        workers = [
+            Process(target=_island, args=(i, shm.name, layout, barrier, stop_event, base + i, generations,
+                                          migration_interval, mutation_rate, time_limit, barrier_timeout))
+            for i in range(islands)
+        ]
+        for w in workers:
+            w.start()
+        _join(workers, barrier, stop_event, deadline, join_timeout)
+
+        failed = [(i, w.exitcode) for i, w in enumerate(workers) if w.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Đảo kết thúc lỗi (chỉ số, exit code): {failed}")
+        if barrier.broken:
+            raise RuntimeError(f"Các đảo không gặp nhau ở barrier trong {barrier_timeout}s")
+
+        fitness = arrays['fitness']
+        island, idx = np.unravel_index(int(fitness.argmax()), fitness.shape)
+        best_state = tuple(arrays['population'][island, idx].tolist())
+        best_score = int(fitness[island, idx])
+        if deadline is not None and arrays['timed_out'].any():
+            deadline.timed_out = True
+        if stats is not None:
+            stats.update(
+                seconds=time.perf_counter() - start,
+                generations=arrays['generations'].tolist(),
+                evaluations=arrays['evaluations'].tolist(),
+                island_best=fitness.max(axis=1).tolist(),
+            )
+        del arrays, fitness
+    finally:
+        shm.close()
+        shm.unlink()
+    return best_state, best_score
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    from xephau_nosimpleai import EightQueensProblem, analyze
+
+    random.seed(40)
+    problem = EightQueensProblem()
+
+    print("=" * 60)
+    print("ISLAND-MODEL GENETIC ALGORITHM")
+    print("=" * 60)
+    stats = {}
+    sol = island_genetic_algorithm(problem, islands=4, stats=stats)[0]
+    print(f"Kết quả: {sol}")
+    analyze(sol, problem)
+    print(f"Số thế hệ mỗi đảo: {stats['generations']}, "
+          f"số lần đánh giá: {sum(stats['evaluations'])}, thời gian: {stats['seconds']:.2f}s")
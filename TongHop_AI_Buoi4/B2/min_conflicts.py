@@ -0,0 +1,221 @@
+import os
+import sys
+import random
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.queens_eval import max_pairs
+from common.deadline import NO_DEADLINE
+
+
+# ------------------------
+# Tập cột đang xung đột: thêm/xóa/chọn ngẫu nhiên đều O(1)
+# ------------------------
+class ConflictSet:
+    def __init__(self, cols=()):
+        self.items = []
+        self.pos = {}
+        for col in cols:
+            self.add(col)
+
+    def add(self, col):
+        if col not in self.pos:
+            self.pos[col] = len(self.items)
+            self.items.append(col)
+
+    def remove(self, col):
+        i = self.pos.pop(col)
+        last = self.items.pop()
+        if last != col:
+            self.items[i] = last
+            self.pos[last] = i
+
+    def choice(self, rand):
+        return self.items[int(rand() * len(self.items))]
+
+    def __len__(self):
+        return len(self.items)
+
+
+# ------------------------
+# Khởi tạo
+# ------------------------
+def greedy_permutation(n, rand, free_tail=None, max_tries=None):
+    """
+    Khởi tạo tham lam dạng hoán vị (kiểu QS4 của Sosic & Gu): hàng luôn khác
+    nhau, mỗi cột lần lượt đổi chỗ với một cột phía sau được chọn ngẫu nhiên
+    cho tới khi không trùng đường chéo nào. free_tail cột cuối để ngẫu nhiên,
+    vì lúc đó gần như không còn hàng trống đường chéo.
+    """
+    free_tail = min(n, 50 if free_tail is None else free_tail)
+    max_tries = max_tries or 3 * n
+    perm = list(range(n))
+    for i in range(n - 1, 0, -1):
+        j = int(rand() * (i + 1))
+        perm[i], perm[j] = perm[j], perm[i]
+
+    diag = bytearray(2 * n - 1)
+    anti = bytearray(2 * n - 1)
+    offset = n - 1
+    for col in range(n - free_tail):
+        span = n - col
+        for _ in range(max_tries):
+            j = col + int(rand() * span)
+            row = perm[j]
+            if not diag[row - col + offset] and not anti[row + col]:
+                break
+        perm[col], perm[j] = row, perm[col]
+        diag[row - col + offset] = 1
+        anti[row + col] = 1
+    return np.array(perm, dtype=np.int32)
+
+
+def line_counts(rows):
+    """Số quân trên mỗi hàng, đường chéo, đường chéo phụ (np.bincount)"""
+    n = len(rows)
+    cols = np.arange(n, dtype=np.int32)
+    return (
+        np.bincount(rows, minlength=n).astype(np.int32),
+        np.bincount(rows - cols + n - 1, minlength=2 * n - 1).astype(np.int32),
+        np.bincount(rows + cols, minlength=2 * n - 1).astype(np.int32),
+    )
+
+
+def count_attacking(rows):
+    return int(sum((c.astype(np.int64) * (c - 1) // 2).sum() for c in line_counts(rows)))
+
+
+# ------------------------
+# Min-conflicts
+# ------------------------
+def min_conflicts(problem, max_steps=None, greedy_init=False, restarts=5, noise=0.02, tabu=10,
+                  stats=None, deadline=None):
+    """
+    Min-conflicts cho n quân hậu (Minton et al.), dùng được tới n = 1.000.000.
+
+    Mỗi bước chọn ngẫu nhiên một cột trong tập cột đang xung đột, đưa quân
+    sang hàng ít xung đột nhất (hòa thì chọn ngẫu nhiên). Hàng được đánh giá
+    cùng lúc bằng NumPy trên ba mảng đếm int32, nên bộ nhớ chỉ O(n).
+    Để thoát cực tiểu địa phương/vùng bằng phẳng (hay gặp khi n nhỏ): quân
+    vừa rời một hàng không được quay lại hàng đó trong tabu bước, và với xác
+    suất noise quân được đưa sang một hàng ngẫu nhiên (random walk).
+
+    Mặc định lần đầu bắt đầu từ problem.initial_state (ngẫu nhiên nếu không
+    có), các lần khởi động lại dùng trạng thái ngẫu nhiên. greedy_init=True:
+    mọi lần đều khởi tạo bằng greedy_permutation (bỏ qua initial_state), chỉ
+    còn vài chục xung đột; cần cho n lớn (từ khoảng 10.000 trở lên).
+    Hết max_steps (mặc định max(1000, 10 * n)) mà chưa xong thì khởi động lại
+    (tối đa restarts lần).
+    Hết deadline (common.deadline) thì dừng và trả về trạng thái tốt nhất.
+
+    Trả về (best_state, best_score) như các thuật toán khác;
+    stats (dict, tùy chọn) nhận thời gian từng giai đoạn và số bước.
+    """
+    n = problem.n
+    max_steps = max(1000, 10 * n) if max_steps is None else max_steps
+    deadline = deadline or NO_DEADLINE
+    stats = stats if stats is not None else {}
+    stats.update(init_s=0.0, repair_s=0.0, verify_s=0.0, steps=0, restarts=0,
+                 initial_conflicted=None)
+    rand = random.random
+    rng = np.random.default_rng(random.randrange(2 ** 32))
+    cols = np.arange(n, dtype=np.int32)
+    offset = n - 1
+
+    best_rows, best_conflicts = None, None
+    for attempt in range(restarts + 1):
+        start = time.perf_counter()
+        if greedy_init:
+            rows = greedy_permutation(n, rand)
+        elif attempt == 0 and getattr(problem, 'initial_state', None) is not None:
+            rows = np.array(problem.initial_state, dtype=np.int32)
+        else:
+            rows = rng.integers(0, n, n, dtype=np.int32)
+        R, D, A = line_counts(rows)
+        per_col = R[rows] + D[rows - cols + offset] + A[rows + cols] - 3
+        conflicted = ConflictSet(np.flatnonzero(per_col).tolist())
+        if stats['initial_conflicted'] is None:
+            stats['initial_conflicted'] = len(conflicted)
+        stats['init_s'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        steps = 0
+        tabu_row = np.zeros(n, dtype=np.int32)
+        tabu_until = np.zeros(n, dtype=np.int64)
+        while conflicted and steps < max_steps and not deadline.expired():
+            col = conflicted.choice(rand)
+            old = int(rows[col])
+            if R[old] + D[old - col + offset] + A[old + col] == 3:
+                conflicted.remove(col)
+                continue
+            steps += 1
+
+            # Nhấc quân ra rồi đánh giá mọi hàng của cột col cùng lúc
+            R[old] -= 1
+            D[old - col + offset] -= 1
+            A[old + col] -= 1
+            conf = R + D[cols - col + offset] + A[cols + col]
+            if tabu_until[col] > steps:
+                conf[tabu_row[col]] = n  # không quay lại hàng vừa rời
+            if noise and rand() < noise:
+                row = int(rand() * n)  # bước nhiễu
+                best = conf[row]
+            else:
+                best = conf.min()
+                candidates = np.flatnonzero(conf == best)
+                row = int(candidates[int(rand() * len(candidates))])
+            if row != old:
+                tabu_row[col], tabu_until[col] = old, steps + tabu
+            R[row] += 1
+            D[row - col + offset] += 1
+            A[row + col] += 1
+            rows[col] = row
+
+            if best == 0:
+                conflicted.remove(col)
+            else:
+                # Các quân chung đường với vị trí mới giờ cũng bị xung đột
+                hit = (rows == row) | (rows - cols == row - col) | (rows + cols == row + col)
+                for other in np.flatnonzero(hit).tolist():
+                    conflicted.add(other)
+        stats['repair_s'] += time.perf_counter() - start
+        stats['steps'] += steps
+
+        start = time.perf_counter()
+        conflicts = count_attacking(rows)
+        stats['verify_s'] += time.perf_counter() - start
+        if best_conflicts is None or conflicts < best_conflicts:
+            best_rows, best_conflicts = rows, conflicts
+        if conflicts == 0 or deadline.expired():
+            break
+        stats['restarts'] += 1
+
+    return tuple(best_rows.tolist()), max_pairs(n) - best_conflicts
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    from xephau_nosimpleai import EightQueensProblem, analyze
+
+    random.seed(42)
+    problem = EightQueensProblem(n=8)
+    state, score = min_conflicts(problem)
+    print(f"Kết quả: {state}")
+    analyze(state, problem)
+
+    for n in (1000, 100000, 1000000):
+        print("\n" + "=" * 60)
+        print(f"MIN-CONFLICTS n = {n}")
+        print("=" * 60)
+        problem = EightQueensProblem(n=n)
+        stats = {}
+        state, score = min_conflicts(problem, greedy_init=True, stats=stats)
+        print(f"Giá trị hàm đánh giá: {score}/{problem.max_score}")
+        print(f"Xung đột ban đầu: {stats['initial_conflicted']} cột, "
+              f"số bước sửa: {stats['steps']}, số lần khởi động lại: {stats['restarts']}")
+        print(f"Khởi tạo: {stats['init_s']:.2f}s, sửa: {stats['repair_s']:.2f}s, "
+              f"kiểm tra: {stats['verify_s']:.2f}s")
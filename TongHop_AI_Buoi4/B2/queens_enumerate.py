@@ -0,0 +1,155 @@
+import os
+import time
+from multiprocessing import Pool
+
+
+# ------------------------
+# Quay lui trên bitmask
+# ------------------------
+# Duyệt từng cột; ba mask đánh dấu hàng đã có quân, đường chéo và đường chéo
+# phụ đang bị chiếm ở cột hiện tại. Sang cột kế tiếp, hai mask đường chéo
+# dịch đi một bit. Hàng trống = các bit 1 của ~(rows | ld | rd) & full,
+# lấy lần lượt bit thấp nhất bằng x & -x.
+
+def _place(n, prefix):
+    """Mask (rows, ld, rd) sau khi đặt các quân trong prefix; None nếu xung đột"""
+    full = (1 << n) - 1
+    rows = ld = rd = 0
+    for row in prefix:
+        bit = 1 << row
+        if (rows | ld | rd) & bit:
+            return None
+        rows |= bit
+        ld = ((ld | bit) << 1) & full
+        rd = (rd | bit) >> 1
+    return rows, ld, rd
+
+
+def _count(full, rows, ld, rd):
+    if rows == full:
+        return 1
+    free = ~(rows | ld | rd) & full
+    total = 0
+    while free:
+        bit = free & -free
+        free ^= bit
+        total += _count(full, rows | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    return total
+
+
+def _solutions(full, rows, ld, rd, state):
+    if rows == full:
+        yield tuple(state)
+        return
+    free = ~(rows | ld | rd) & full
+    while free:
+        bit = free & -free
+        free ^= bit
+        state.append(bit.bit_length() - 1)
+        yield from _solutions(full, rows | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1, state)
+        state.pop()
+
+
+def symmetric_prefixes(n):
+    """
+    Các tiền tố (hàng cột 0, hàng cột 1) chỉ thuộc một nửa không gian theo
+    phép lật dọc row -> n-1-row: hàng cột 0 ở nửa trên, hoặc đúng hàng giữa
+    (n lẻ) và hàng cột 1 ở nửa trên. Mỗi lời giải của nửa này ứng với đúng
+    một lời giải đối xứng ở nửa kia.
+    """
+    half = n // 2
+    for r0 in range(half):
+        for r1 in range(n):
+            if abs(r1 - r0) > 1:
+                yield r0, r1
+    if n % 2:
+        for r1 in range(half):
+            if abs(r1 - half) > 1:
+                yield half, r1
+
+
+def mirror(state):
+    n = len(state)
+    return tuple(n - 1 - row for row in state)
+
+
+def _count_prefix(task):
+    n, prefix = task
+    masks = _place(n, prefix)
+    return 0 if masks is None else _count((1 << n) - 1, *masks)
+
+
+def _solutions_prefix(task):
+    n, prefix = task
+    masks = _place(n, prefix)
+    if masks is None:
+        return []
+    return list(_solutions((1 << n) - 1, *masks, list(prefix)))
+
+
+# ------------------------
+# Đếm và liệt kê
+# ------------------------
+def count_solutions(n, processes=None):
+    """
+    Số lời giải chính xác của bài toán n quân hậu.
+    Chỉ duyệt nửa không gian theo symmetric_prefixes rồi nhân 2; các tiền tố
+    được chia cho một Pool (processes=1 thì chạy tuần tự).
+    """
+    if n == 1:
+        return 1
+    tasks = [(n, prefix) for prefix in symmetric_prefixes(n)]
+    processes = processes or os.cpu_count()
+    if processes == 1:
+        return 2 * sum(map(_count_prefix, tasks))
+    with Pool(processes) as pool:
+        return 2 * sum(pool.imap_unordered(_count_prefix, tasks))
+
+
+def iter_solutions(n, processes=1):
+    """
+    Sinh mọi lời giải dạng tuple (state[col] = hàng), cùng định dạng với state
+    của EightQueensProblem. Mỗi lời giải của nửa không gian được sinh kèm ảnh
+    lật dọc của nó. processes > 1: mỗi worker trả về lời giải của một tiền tố.
+    """
+    if n == 1:
+        yield (0,)
+        return
+    tasks = [(n, prefix) for prefix in symmetric_prefixes(n)]
+    if processes == 1:
+        for _, prefix in tasks:
+            masks = _place(n, prefix)
+            if masks is None:
+                continue
+            for state in _solutions((1 << n) - 1, *masks, list(prefix)):
+                yield state
+                yield mirror(state)
+        return
+    with Pool(processes or os.cpu_count()) as pool:
+        for states in pool.imap(_solutions_prefix, tasks):
+            for state in states:
+                yield state
+                yield mirror(state)
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    from xephau_nosimpleai import EightQueensProblem, print_board
+
+    problem = EightQueensProblem(n=8)
+    solutions = list(iter_solutions(8))
+    valid = sum(problem.value(s) == problem.max_score for s in solutions)
+    print(f"n = 8: {len(solutions)} lời giải, {valid} lời giải đạt {problem.max_score}/{problem.max_score}, "
+          f"{len(set(solutions))} khác nhau")
+    print(f"Lời giải đầu tiên: {solutions[0]}")
+    print_board(solutions[0])
+
+    print("\n" + "=" * 60)
+    print("ĐẾM SỐ LỜI GIẢI")
+    print("=" * 60)
+    for n in range(4, 14):
+        start = time.perf_counter()
+        total = count_solutions(n)
+        print(f"n = {n:2}: {total:>8} lời giải ({time.perf_counter() - start:.2f}s)")
@@ -0,0 +1,152 @@
+import os
+import sys
+import random
+from itertools import chain
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.queens_state import PermutationState
+from xephau_nosimpleai import EightQueensProblem, hill_climbing, simulated_annealing, genetic_algorithm, analyze
+
+
+# ------------------------
+# Lai ghép giữ hoán vị
+# ------------------------
+def cut_points(n):
+    """Hai điểm cắt a < b trong 0..n"""
+    a, b = sorted(random.sample(range(n + 1), 2))
+    return a, b
+
+
+def pmx_crossover(p1, p2):
+    """
+    Partially Mapped Crossover: con giữ đoạn [a, b) của cha này, phần còn lại
+    lấy từ cha kia; giá trị bị trùng được đổi theo ánh xạ của đoạn giữa.
+    Trả về 2 con, đều là hoán vị.
+    """
+    a, b = cut_points(len(p1))
+
+    def child(x, y):
+        result = list(y)
+        result[a:b] = x[a:b]
+        mapping = {x[k]: y[k] for k in range(a, b)}
+        for k in chain(range(a), range(b, len(x))):
+            v = y[k]
+            while v in mapping:
+                v = mapping[v]
+            result[k] = v
+        return tuple(result)
+
+    return child(p1, p2), child(p2, p1)
+
+
+def order_crossover(p1, p2):
+    """
+    Order Crossover (OX): con giữ đoạn [a, b) của cha này, các vị trí còn lại
+    (bắt đầu từ b, vòng lại đầu) điền theo thứ tự xuất hiện trong cha kia.
+    Trả về 2 con, đều là hoán vị.
+    """
+    n = len(p1)
+    a, b = cut_points(n)
+    positions = list(range(b, n)) + list(range(a))
+
+    def child(x, y):
+        result = list(x)
+        used = set(x[a:b])
+        rest = [v for v in chain(y[b:], y[:b]) if v not in used]
+        for pos, v in zip(positions, rest):
+            result[pos] = v
+        return tuple(result)
+
+    return child(p1, p2), child(p2, p1)
+
+
+CROSSOVERS = {'pmx': pmx_crossover, 'ox': order_crossover}
+
+
+# ------------------------
+# Bài toán n quân hậu dạng hoán vị
+# ------------------------
+class PermutationQueensProblem(EightQueensProblem):
+    """
+    State luôn là hoán vị của 0..n-1 (mỗi hàng một quân), nước đi là đổi
+    hàng của hai cột. Không gian tìm kiếm còn n! thay vì n^n và không còn
+    xung đột hàng; value() vẫn là số cặp không tấn công nhau như lớp cha.
+
+    hill_climbing, simulated_annealing và genetic_algorithm của
+    xephau_nosimpleai dùng được trực tiếp: tracker() trả về PermutationState,
+    crossover() là PMX hoặc OX, mutate() đổi chỗ hai cột.
+    """
+
+    def __init__(self, state=None, n=8, crossover='pmx'):
+        if state is None:
+            state = tuple(random.sample(range(n), n))
+        super().__init__(tuple(state), n=len(state))
+        self.crossover_op = CROSSOVERS[crossover]
+
+    def neighbors(self, state):
+        """Sinh ra các state đổi chỗ hai cột i < j"""
+        for i in range(self.n - 1):
+            for j in range(i + 1, self.n):
+                new_state = list(state)
+                new_state[i], new_state[j] = new_state[j], new_state[i]
+                yield tuple(new_state)
+
+    def tracker(self, state):
+        return PermutationState(state)
+
+    def random_state(self):
+        return tuple(random.sample(range(self.n), self.n))
+
+    def crossover(self, s1, s2):
+        return self.crossover_op(s1, s2)
+
+    def mutate(self, state):
+        s = list(state)
+        i, j = random.sample(range(self.n), 2)
+        s[i], s[j] = s[j], s[i]
+        return tuple(s)
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    random.seed(40)
+
+    print("=" * 60)
+    print("HILL CLIMBING (HOÁN VỊ)")
+    print("=" * 60)
+    problem = PermutationQueensProblem()
+    print(f"State ban đầu: {problem.initial_state}")
+    sol1 = hill_climbing(problem)
+    print(f"Kết quả: {sol1}")
+    analyze(sol1, problem)
+
+    print("\n" + "=" * 60)
+    print("SIMULATED ANNEALING (HOÁN VỊ)")
+    print("=" * 60)
+    problem2 = PermutationQueensProblem()
+    print(f"State ban đầu: {problem2.initial_state}")
+    sol2 = simulated_annealing(problem2)
+    print(f"Kết quả: {sol2}")
+    analyze(sol2, problem2)
+
+    print("\n" + "=" * 60)
+    print("GENETIC ALGORITHM (HOÁN VỊ, OX)")
+    print("=" * 60)
+    sol3 = genetic_algorithm(PermutationQueensProblem(problem.initial_state, crossover='ox'))
+    print(f"Kết quả: {sol3}")
+    analyze(sol3, problem)
+
+    # Tỉ lệ giải được của hill climbing trên 200 state ban đầu ngẫu nhiên
+    print("\n" + "=" * 60)
+    print("SO SÁNH TỈ LỆ THÀNH CÔNG CỦA HILL CLIMBING")
+    print("=" * 60)
+    for n in (8, 16):
+        for name, cls in (("Tự do (n^n)", EightQueensProblem), ("Hoán vị (n!)", PermutationQueensProblem)):
+            random.seed(0)
+            solved = 0
+            for _ in range(200):
+                p = cls(n=n)
+                solved += p.value(hill_climbing(p)) == p.max_score
+            print(f"n = {n:2}, {name:13}: {solved}/200")
@@ -1,126 +1,191 @@
-from simpleai.search import SearchProblem
-from simpleai.search import astar, greedy
-import random
-
-class EightQueensHeuristicProblem(SearchProblem):
-    """
-    Bài toán 8 quân hậu cho heuristic search (Greedy Best-First, A*).
-    State: tuple 8 phần tử, mỗi phần tử là vị trí hàng (0..7) của quân hậu trong cột tương ứng.
-    """
-
-    def __init__(self, initial_state=None):
-        if initial_state is None:
-            initial_state = tuple(random.randint(0, 7) for _ in range(8))
-        super().__init__(initial_state)
-
-    def actions(self, state):
-        """
-        Action = (col, new_row): di chuyển quân hậu ở cột col đến hàng new_row
-        """
-        actions = []
-        for col in range(8):
-            for new_row in range(8):
-                if new_row != state[col]:
-                    actions.append((col, new_row))
-        return actions
-
-    def result(self, state, action):
-        """
-        Thực hiện action trên state
-        """
-        col, new_row = action
-        new_state = list(state)
-        new_state[col] = new_row
-        return tuple(new_state)
-
-    def is_goal(self, state):
-        """
-        Trạng thái đích: không quân hậu nào tấn công nhau
-        """
-        return self.value(state) == 28
-
-    def value(self, state):
-        """
-        Trả về số cặp quân hậu không tấn công nhau.
-        Tối đa = 28 (8*7/2)
-        """
-        non_attacking_pairs = 0
-        n = len(state)
-        for i in range(n):
-            for j in range(i + 1, n):
-                if not self.is_attacking(state, i, j):
-                    non_attacking_pairs += 1
-        return non_attacking_pairs
-
-    def heuristic(self, state):
-        """
-        Heuristic = số cặp quân hậu đang xung đột
-        """
-        return 28 - self.value(state)
-
-    def is_attacking(self, state, i, j):
-        if state[i] == state[j]:
-            return True
-        if abs(state[i] - state[j]) == abs(i - j):
-            return True
-        return False
-
-
-def print_board(state):
-    """
-    In bàn cờ ra màn hình
-    """
-    print("\nBàn cờ 8x8:")
-    print("  " + " ".join(str(i) for i in range(8)))
-    for row in range(8):
-        line = f"{row} "
-        for col in range(8):
-            if state[col] == row:
-                line += "Q "
-            else:
-                line += ". "
-        print(line)
-    print()
-
-
-def solve_with_greedy():
-    print("=" * 60)
-    print("GREEDY BEST-FIRST SEARCH")
-    print("=" * 60)
-    problem = EightQueensHeuristicProblem()
-    print(f"State ban đầu: {problem.initial_state}")
-    result = greedy(problem, problem.heuristic)
-    print(f"\nKết quả: {result.state}")
-    print_board(result.state)
-    print(f"Số cặp không xung đột: {problem.value(result.state)}/28")
-
-
-def solve_with_astar():
-    print("=" * 60)
-    print("A* SEARCH")
-    print("=" * 60)
-    problem = EightQueensHeuristicProblem()
-    print(f"State ban đầu: {problem.initial_state}")
-    result = astar(problem, problem.heuristic)
-    print(f"\nKết quả: {result.state}")
-    print_board(result.state)
-    print(f"Số cặp không xung đột: {problem.value(result.state)}/28")
-
-
-def main():
-    print("BÀI TOÁN 8 QUÂN HẬU VỚI HEURISTIC SEARCH")
-    print("=" * 80)
-    try:
-        solve_with_greedy()
-    except Exception as e:
-        print(f"Lỗi Greedy: {e}")
-
-    try:
-        solve_with_astar()
-    except Exception as e:
-        print(f"Lỗi A*: {e}")
-
-
-if __name__ == "__main__":
-    random.seed(42)
-    main()
+from simpleai.search import SearchProblem
+from simpleai.search import astar, greedy
+import os
+import sys
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.queens_eval import attacking_pairs, max_pairs, non_attacking_pairs
+from common.queens_incremental import IncrementalQueensMixin
+from bounded_astar import bounded_astar
+
+class EightQueensHeuristicProblem(SearchProblem):
+    """
+    Bài toán n quân hậu (mặc định 8) cho heuristic search (Greedy Best-First, A*).
+    State: tuple n phần tử, mỗi phần tử là vị trí hàng (0..n-1) của quân hậu trong cột tương ứng.
+    """
+
+    def __init__(self, initial_state=None, n=8):
+        if initial_state is None:
+            initial_state = tuple(random.randint(0, n - 1) for _ in range(n))
+        self.n = len(initial_state)
+        self.max_score = max_pairs(self.n)
+        super().__init__(initial_state)
+
+    def actions(self, state):
+        """
+        Action = (col, new_row): di chuyển quân hậu ở cột col đến hàng new_row
+        """
+        actions = []
+        for col in range(self.n):
+            for new_row in range(self.n):
+                if new_row != state[col]:
+                    actions.append((col, new_row))
+        return actions
+
+    def result(self, state, action):
+        """
+        Thực hiện action trên state
+        """
+        col, new_row = action
+        new_state = list(state)
+        new_state[col] = new_row
+        return tuple(new_state)
+
+    def is_goal(self, state):
+        """
+        Trạng thái đích: không quân hậu nào tấn công nhau
+        """
+        return self.value(state) == self.max_score
+
+    def value(self, state):
+        """
+        Trả về số cặp quân hậu không tấn công nhau, O(n).
+        Tối đa = n*(n-1)/2 (28 với n = 8)
+        """
+        return non_attacking_pairs(state)
+
+    def heuristic(self, state):
+        """
+        Heuristic = số cặp quân hậu đang xung đột
+        """
+        return attacking_pairs(state)
+
+    def is_attacking(self, state, i, j):
+        if state[i] == state[j]:
+            return True
+        if abs(state[i] - state[j]) == abs(i - j):
+            return True
+        return False
+
+
+class IncrementalQueensHeuristicProblem(IncrementalQueensMixin, EightQueensHeuristicProblem):
+    """
+    Như EightQueensHeuristicProblem, nhưng action được xếp theo delta xung đột
+    và heuristic của state con lấy từ cha + delta thay vì đếm lại
+    """
+
+
+def print_board(state):
+    """
+    In bàn cờ ra màn hình
+    """
+    n = len(state)
+    print(f"\nBàn cờ {n}x{n}:")
+    print("  " + " ".join(str(i) for i in range(n)))
+    for row in range(n):
+        line = f"{row} "
+        for col in range(n):
+            if state[col] == row:
+                line += "Q "
+            else:
+                line += ". "
+        print(line)
+    print()
+
+
+def solve_with_greedy(problem_class=EightQueensHeuristicProblem):
+    print("=" * 60)
+    print(f"GREEDY BEST-FIRST SEARCH ({problem_class.__name__})")
+    print("=" * 60)
+    problem = problem_class()
+    print(f"State ban đầu: {problem.initial_state}")
+    result = greedy(problem, problem.heuristic)
+    print(f"\nKết quả: {result.state}")
+    print_board(result.state)
+    print(f"Số cặp không xung đột: {problem.value(result.state)}/{problem.max_score}")
+
+
+def solve_with_astar(problem_class=EightQueensHeuristicProblem):
+    print("=" * 60)
+    print(f"A* SEARCH ({problem_class.__name__})")
+    print("=" * 60)
+    problem = problem_class()
+    print(f"State ban đầu: {problem.initial_state}")
+    result = astar(problem, problem.heuristic)
+    print(f"\nKết quả: {result.state}")
+    print_board(result.state)
+    print(f"Số cặp không xung đột: {problem.value(result.state)}/{problem.max_score}")
+
+
+# Bản giới hạn bộ nhớ (bounded_astar.py): frontier tối đa frontier_cap node,
+# bảng chuyển vị tối đa max_table state
+def solve_with_bounded_greedy(problem_class=EightQueensHeuristicProblem, frontier_cap=10000, max_table=500000):
+    print("=" * 60)
+    print(f"GREEDY BEST-FIRST GIỚI HẠN FRONTIER ({problem_class.__name__})")
+    print("=" * 60)
+    problem = problem_class()
+    print(f"State ban đầu: {problem.initial_state}")
+    stats = {}
+    result = bounded_astar(problem, frontier_cap=frontier_cap, greedy=True, max_table=max_table,
+                           stats=stats)
+    if result is None:
+        print("Không tìm được lời giải trong giới hạn frontier/bảng")
+        return
+    print(f"\nKết quả: {result.state}")
+    print_board(result.state)
+    print(f"Số cặp không xung đột: {problem.value(result.state)}/{problem.max_score}")
+    print(f"Mở rộng: {stats['expanded']} node, sinh: {stats['generated']}, "
+          f"frontier lớn nhất: {stats['peak_frontier']}/{frontier_cap}")
+
+
+def solve_with_bounded_astar(problem_class=EightQueensHeuristicProblem, frontier_cap=10000, max_table=500000):
+    print("=" * 60)
+    print(f"A* GIỚI HẠN FRONTIER ({problem_class.__name__})")
+    print("=" * 60)
+    problem = problem_class()
+    print(f"State ban đầu: {problem.initial_state}")
+    stats = {}
+    result = bounded_astar(problem, frontier_cap=frontier_cap, greedy=False, max_table=max_table,
+                           stats=stats)
+    if result is None:
+        print("Không tìm được lời giải trong giới hạn frontier/bảng")
+        return
+    print(f"\nKết quả: {result.state}")
+    print_board(result.state)
+    print(f"Số cặp không xung đột: {problem.value(result.state)}/{problem.max_score}")
+    print(f"Mở rộng: {stats['expanded']} node, sinh: {stats['generated']}, "
+          f"frontier lớn nhất: {stats['peak_frontier']}/{frontier_cap}")
+
+
+def main():
+    print("BÀI TOÁN 8 QUÂN HẬU VỚI HEURISTIC SEARCH")
+    print("=" * 80)
+    try:
+        solve_with_greedy()
+    except Exception as e:
+        print(f"Lỗi Greedy: {e}")
+
+    try:
+        solve_with_astar()
+    except Exception as e:
+        print(f"Lỗi A*: {e}")
+
+    # Cùng thuật toán nhưng action sắp theo delta, heuristic tính tăng dần
+    try:
+        solve_with_greedy(IncrementalQueensHeuristicProblem)
+        solve_with_astar(IncrementalQueensHeuristicProblem)
+    except Exception as e:
+        print(f"Lỗi (incremental): {e}")
+
+    # So sánh với bản giới hạn bộ nhớ
+    try:
+        solve_with_bounded_greedy(IncrementalQueensHeuristicProblem)
+        solve_with_bounded_astar(IncrementalQueensHeuristicProblem)
+    except Exception as e:
+        print(f"Lỗi (giới hạn frontier): {e}")
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    main()
@@ -1,162 +1,212 @@
-import random
-import math
-
-# ------------------------
-# Lớp Bài toán 8 quân hậu
-# ------------------------
-class EightQueensProblem:
-    def __init__(self, state=None, n=8):
-        self.n = n
-        if state is None:
-            state = tuple(random.randint(0, n - 1) for _ in range(n))
-        self.initial_state = state
-
-    def value(self, state):
-        """Hàm đánh giá: số cặp quân hậu không tấn công lẫn nhau"""
-        non_attacking_pairs = 0
-        for i in range(self.n):
-            for j in range(i + 1, self.n):
-                if not self.is_attacking(state, i, j):
-                    non_attacking_pairs += 1
-        return non_attacking_pairs
-
-    def is_attacking(self, state, i, j):
-        return (
-            state[i] == state[j] or
-            abs(state[i] - state[j]) == abs(i - j)
-        )
-
-    def neighbors(self, state):
-        """Sinh ra tất cả các state láng giềng"""
-        for col in range(self.n):
-            for row in range(self.n):
-                if row != state[col]:
-                    new_state = list(state)
-                    new_state[col] = row
-                    yield tuple(new_state)
-
-    def random_state(self):
-        return tuple(random.randint(0, self.n - 1) for _ in range(self.n))
-
-    def crossover(self, s1, s2):
-        point = random.randint(1, self.n - 2)
-        child1 = s1[:point] + s2[point:]
-        child2 = s2[:point] + s1[point:]
-        return child1, child2
-
-    def mutate(self, state):
-        s = list(state)
-        col = random.randint(0, self.n - 1)
-        s[col] = random.randint(0, self.n - 1)
-        return tuple(s)
-
-
-# ------------------------
-# Các thuật toán
-# ------------------------
-def hill_climbing(problem, max_iter=1000):
-    current = problem.initial_state
-    for _ in range(max_iter):
-        neighbors = list(problem.neighbors(current))
-        if not neighbors:
-            break
-        neighbor = max(neighbors, key=problem.value)
-        if problem.value(neighbor) <= problem.value(current):
-            break
-        current = neighbor
-    return current
-
-
-def simulated_annealing(problem, max_iter=1000, temp=1000, cooling=0.95):
-    current = problem.initial_state
-    for i in range(max_iter):
-        T = temp * (cooling ** i)
-        if T <= 0.0001:
-            break
-        neighbor = random.choice(list(problem.neighbors(current)))
-        delta = problem.value(neighbor) - problem.value(current)
-        if delta > 0 or random.random() < math.exp(delta / T):
-            current = neighbor
-    return current
-
-
-def genetic_algorithm(problem, population_size=100, generations=200, mutation_rate=0.1):
-    population = [problem.random_state() for _ in range(population_size)]
-
-    for _ in range(generations):
-        # Chọn lọc theo fitness
-        population.sort(key=problem.value, reverse=True)
-        next_gen = population[:10]  # elitism: giữ top 10
-
-        while len(next_gen) < population_size:
-            p1, p2 = random.sample(population[:50], 2)  # chọn từ top 50
-            c1, c2 = problem.crossover(p1, p2)
-            if random.random() < mutation_rate:
-                c1 = problem.mutate(c1)
-            if random.random() < mutation_rate:
-                c2 = problem.mutate(c2)
-            next_gen.extend([c1, c2])
-
-        population = next_gen[:population_size]
-
-    return max(population, key=problem.value)
-
-
-# ------------------------
-# Hàm hỗ trợ
-# ------------------------
-def print_board(state):
-    n = len(state)
-    print("\nBàn cờ 8x8:")
-    print("  " + " ".join(str(i) for i in range(n)))
-    for row in range(n):
-        line = f"{row} "
-        for col in range(n):
-            line += "Q " if state[col] == row else ". "
-        print(line)
-
-
-def analyze(state, problem):
-    conflicts = 28 - problem.value(state)
-    print(f"Số conflict: {conflicts}")
-    print(f"Giá trị hàm đánh giá: {problem.value(state)}/28")
-    print_board(state)
-    if conflicts == 0:
-        print("Đã tìm được lời giải hoàn hảo!")
-    else:
-        print("Chưa tìm được lời giải hoàn hảo.")
-
-
-# ------------------------
-# Main
-# ------------------------
-if __name__ == "__main__":
-    random.seed(40)
-
-    print("=" * 60)
-    print("HILL CLIMBING SEARCH")
-    print("=" * 60)
-    problem = EightQueensProblem()
-    print(f"State ban đầu: {problem.initial_state}")
-    print(f"Giá trị ban đầu: {problem.value(problem.initial_state)}/28")
-    sol1 = hill_climbing(problem)
-    print(f"Kết quả: {sol1}")
-    analyze(sol1, problem)
-
-    print("\n" + "=" * 60)
-    print("SIMULATED ANNEALING SEARCH")
-    print("=" * 60)
-    problem2 = EightQueensProblem()
-    print(f"State ban đầu: {problem2.initial_state}")
-    print(f"Giá trị ban đầu: {problem2.value(problem2.initial_state)}/28")
-    sol2 = simulated_annealing(problem2)
-    print(f"Kết quả: {sol2}")
-    analyze(sol2, problem2)
-
-    print("\n" + "=" * 60)
-    print("GENETIC ALGORITHM SEARCH")
-    print("=" * 60)
-    print("Genetic Algorithm khởi tạo quần thể ngẫu nhiên, không cần state ban đầu cụ thể")
-    sol3 = genetic_algorithm(problem)
-    print(f"Kết quả: {sol3}")
-    analyze(sol3, problem)
+import os
+import sys
+import random
+import math
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.queens_eval import max_pairs, non_attacking_pairs
+from common.queens_state import QueensState
+from common.memo import MemoizedValue
+from common.instrument import NULL_INSTRUMENT
+from common.progress import Clock, last
+from common.deadline import NO_DEADLINE
+
+# ------------------------
+# Lớp Bài toán 8 quân hậu
+# ------------------------
+class EightQueensProblem:
+    def __init__(self, state=None, n=8):
+        self.n = n
+        self.max_score = max_pairs(n)
+        if state is None:
+            state = tuple(random.randint(0, n - 1) for _ in range(n))
+        self.initial_state = state
+
+    def value(self, state):
+        """Hàm đánh giá: số cặp quân hậu không tấn công lẫn nhau, O(n)"""
+        return non_attacking_pairs(state)
+
+    def is_attacking(self, state, i, j):
+        return (
+            state[i] == state[j] or
+            abs(state[i] - state[j]) == abs(i - j)
+        )
+
+    def neighbors(self, state):
+        """Sinh ra tất cả các state láng giềng"""
+        for col in range(self.n):
+            for row in range(self.n):
+                if row != state[col]:
+                    new_state = list(state)
+                    new_state[col] = row
+                    yield tuple(new_state)
+
+    def tracker(self, state):
+        """Trạng thái có bộ đếm, đánh giá nước đi O(1) cho hill climbing / SA"""
+        return QueensState(state)
+
+    def random_state(self):
+        return tuple(random.randint(0, self.n - 1) for _ in range(self.n))
+
+    def crossover(self, s1, s2):
+        point = random.randint(1, self.n - 2)
+        child1 = s1[:point] + s2[point:]
+        child2 = s2[:point] + s1[point:]
+        return child1, child2
+
+    def mutate(self, state):
+        s = list(state)
+        col = random.randint(0, self.n - 1)
+        s[col] = random.randint(0, self.n - 1)
+        return tuple(s)
+
+
+class CachedEightQueensProblem(MemoizedValue, EightQueensProblem):
+    """EightQueensProblem ghi nhớ value(state); xem cache_info() để biết tỉ lệ hit"""
+
+
+# ------------------------
+# Các thuật toán
+# ------------------------
+def hill_climbing(problem, max_iter=1000, deadline=None):
+    deadline = deadline or NO_DEADLINE
+    current = problem.tracker(problem.initial_state)
+    for _ in range(max_iter):
+        if deadline.expired():
+            break
+        # Láng giềng tốt nhất = nước đi giảm xung đột nhiều nhất (lấy nước đầu tiên nếu hòa)
+        best_move, best_delta = None, 0
+        for col, row in current.moves():
+            d = current.delta(col, row)
+            if d < best_delta:
+                best_move, best_delta = (col, row), d
+        if best_move is None:
+            break
+        current.move(*best_move)
+    return current.state()
+
+
+def simulated_annealing(problem, max_iter=1000, temp=1000, cooling=0.95, deadline=None):
+    deadline = deadline or NO_DEADLINE
+    current = problem.tracker(problem.initial_state)
+    for i in range(max_iter):
+        T = temp * (cooling ** i)
+        if T <= 0.0001 or deadline.expired():
+            break
+        col, row = current.random_move()
+        delta = -current.delta(col, row)  # độ tăng của value
+        if delta > 0 or random.random() < math.exp(delta / T):
+            current.move(col, row)
+    return current.state()
+
+
+def iter_genetic_algorithm(problem, population_size=100, generations=200, mutation_rate=0.1, instrument=None,
+                           deadline=None):
+    """
+    GA dạng generator: yield Progress (common.progress) cho quần thể đầu
+    mỗi thế hệ (iteration 0..generations-1, đã sắp theo fitness), rồi một
+    Progress cuối (iteration = generations) cho quần thể sau thế hệ cuối.
+    Mỗi cá thể chỉ được chấm một lần mỗi thế hệ như bản gốc. Hết deadline
+    thì dừng ngay sau Progress của thế hệ đang xét.
+    """
+    probe = instrument or NULL_INSTRUMENT
+    deadline = deadline or NO_DEADLINE
+    clock = Clock()
+    population = [problem.random_state() for _ in range(population_size)]
+
+    for generation in range(generations):
+        # Chọn lọc theo fitness (sắp xếp ổn định, giảm dần)
+        with probe.phase('selection'):
+            scores = [problem.value(state) for state in population]
+            order = sorted(range(len(population)), key=scores.__getitem__, reverse=True)
+            population = [population[i] for i in order]
+        yield clock(generation, population[0], scores[order[0]], population)
+        if deadline.expired():
+            return
+        next_gen = population[:10]  # elitism: giữ top 10
+
+        with probe.phase('breeding'):
+            while len(next_gen) < population_size:
+                p1, p2 = random.sample(population[:50], 2)  # chọn từ top 50
+                c1, c2 = problem.crossover(p1, p2)
+                if random.random() < mutation_rate:
+                    c1 = problem.mutate(c1)
+                if random.random() < mutation_rate:
+                    c2 = problem.mutate(c2)
+                next_gen.extend([c1, c2])
+
+        population = next_gen[:population_size]
+
+    scores = [problem.value(state) for state in population]
+    best = scores.index(max(scores))
+    yield clock(generations, population[best], scores[best], population)
+
+
+def genetic_algorithm(problem, population_size=100, generations=200, mutation_rate=0.1, instrument=None,
+                      deadline=None):
+    progress = iter_genetic_algorithm(problem, population_size, generations, mutation_rate, instrument, deadline)
+    return last(progress).best_state
+
+
+# ------------------------
+# Hàm hỗ trợ
+# ------------------------
+def print_board(state):
+    n = len(state)
+    print(f"\nBàn cờ {n}x{n}:")
+    print("  " + " ".join(str(i) for i in range(n)))
+    for row in range(n):
+        line = f"{row} "
+        for col in range(n):
+            line += "Q " if state[col] == row else ". "
+        print(line)
+
+
+def analyze(state, problem):
+    conflicts = problem.max_score - problem.value(state)
+    print(f"Số conflict: {conflicts}")
+    print(f"Giá trị hàm đánh giá: {problem.value(state)}/{problem.max_score}")
+    print_board(state)
+    if conflicts == 0:
+        print("Đã tìm được lời giải hoàn hảo!")
+    else:
+        print("Chưa tìm được lời giải hoàn hảo.")
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    random.seed(40)
+
+    print("=" * 60)
+    print("HILL CLIMBING SEARCH")
+    print("=" * 60)
+    problem = EightQueensProblem()
+    print(f"State ban đầu: {problem.initial_state}")
+    print(f"Giá trị ban đầu: {problem.value(problem.initial_state)}/{problem.max_score}")
+    sol1 = hill_climbing(problem)
+    print(f"Kết quả: {sol1}")
+    analyze(sol1, problem)
+
+    print("\n" + "=" * 60)
+    print("SIMULATED ANNEALING SEARCH")
+    print("=" * 60)
+    problem2 = EightQueensProblem()
+    print(f"State ban đầu: {problem2.initial_state}")
+    print(f"Giá trị ban đầu: {problem2.value(problem2.initial_state)}/{problem2.max_score}")
+    sol2 = simulated_annealing(problem2)
+    print(f"Kết quả: {sol2}")
+    analyze(sol2, problem2)
+
+    print("\n" + "=" * 60)
+    print("GENETIC ALGORITHM SEARCH")
+    print("=" * 60)
+    print("Genetic Algorithm khởi tạo quần thể ngẫu nhiên, không cần state ban đầu cụ thể")
+    cached = CachedEightQueensProblem(problem.initial_state)
+    sol3 = genetic_algorithm(cached)
+    print(f"Kết quả: {sol3}")
+    analyze(sol3, problem)
+    info = cached.cache_info()
+    print(f"Bộ nhớ đệm value(): {info.hits} hit / {info.misses} miss "
+          f"({info.hits / (info.hits + info.misses):.0%} hit)")
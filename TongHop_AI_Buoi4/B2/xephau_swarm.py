@@ -1,252 +1,466 @@
-import random
-import math
-
-# ------------------------
-# Bài toán 8 quân hậu
-# ------------------------
-class EightQueensProblem:
-    def __init__(self, n=8):
-        self.n = n
-
-    def value(self, state):
-        non_attacking_pairs = 0
-        for i in range(self.n):
-            for j in range(i + 1, self.n):
-                if not self.is_attacking(state, i, j):
-                    non_attacking_pairs += 1
-        return non_attacking_pairs
-
-    def is_attacking(self, state, i, j):
-        return (
-            state[i] == state[j] or
-            abs(state[i] - state[j]) == abs(i - j)
-        )
-
-    def random_state(self):
-        return [random.randint(0, self.n - 1) for _ in range(self.n)]
-
-
-# ------------------------
-# Ant Colony Optimization (ACO)
-# ------------------------
-def ant_colony_optimization(problem, num_ants=30, max_iter=200, alpha=1, beta=2, rho=0.5, Q=100):
-    n = problem.n
-    pheromone = [[1.0 for _ in range(n)] for _ in range(n)]
-
-    best_state = None
-    best_score = -1
-
-    for _ in range(max_iter):
-        solutions = []
-        scores = []
-
-        for _ in range(num_ants):
-            state = []
-            for col in range(n):
-                probs = [pheromone[col][row] ** alpha for row in range(n)]
-                s = sum(probs)
-                probs = [p / s for p in probs]
-                row = random.choices(range(n), probs)[0]
-                state.append(row)
-
-            score = problem.value(state)
-            solutions.append(state)
-            scores.append(score)
-
-            if score > best_score:
-                best_state = state[:]
-                best_score = score
-
-        # Bốc hơi pheromone
-        for col in range(n):
-            for row in range(n):
-                pheromone[col][row] *= (1 - rho)
-
-        # Cập nhật pheromone
-        for state, score in zip(solutions, scores):
-            for col, row in enumerate(state):
-                pheromone[col][row] += Q * (score / 28.0)
-
-        if best_score == 28:
-            break
-
-    return best_state, best_score
-
-
-# ------------------------
-# Artificial Bee Colony (ABC)
-# ------------------------
-def bee_colony(problem, population_size=30, max_iter=200, limit=50):
-    population = [problem.random_state() for _ in range(population_size)]
-    fitness = [problem.value(ind) for ind in population]
-    trial = [0] * population_size
-
-    best_state = population[fitness.index(max(fitness))][:]
-    best_score = max(fitness)
-
-    for _ in range(max_iter):
-        # Employed bees
-        for i in range(population_size):
-            k = random.randint(0, population_size - 1)
-            while k == i:
-                k = random.randint(0, population_size - 1)
-            j = random.randint(0, problem.n - 1)
-
-            new = population[i][:]
-            new[j] = population[i][j] if random.random() > 0.5 else population[k][j]
-            new_score = problem.value(new)
-
-            if new_score > fitness[i]:
-                population[i] = new
-                fitness[i] = new_score
-                trial[i] = 0
-            else:
-                trial[i] += 1
-
-        # Onlooker bees
-        probs = [f / sum(fitness) for f in fitness]
-        for _ in range(population_size):
-            i = random.choices(range(population_size), probs)[0]
-            k = random.randint(0, population_size - 1)
-            while k == i:
-                k = random.randint(0, population_size - 1)
-            j = random.randint(0, problem.n - 1)
-
-            new = population[i][:]
-            new[j] = population[i][j] if random.random() > 0.5 else population[k][j]
-            new_score = problem.value(new)
-
-            if new_score > fitness[i]:
-                population[i] = new
-                fitness[i] = new_score
-                trial[i] = 0
-            else:
-                trial[i] += 1
-
-        # Scout bees
-        for i in range(population_size):
-            if trial[i] > limit:
-                population[i] = problem.random_state()
-                fitness[i] = problem.value(population[i])
-                trial[i] = 0
-
-        # Cập nhật best
-        idx = fitness.index(max(fitness))
-        if fitness[idx] > best_score:
-            best_score = fitness[idx]
-            best_state = population[idx][:]
-
-        if best_score == 28:
-            break
-
-    return best_state, best_score
-
-
-# ------------------------
-# Gray Wolf Optimizer (GWO)
-# ------------------------
-def gray_wolf_optimizer(problem, population_size=30, max_iter=200):
-    wolves = [problem.random_state() for _ in range(population_size)]
-    fitness = [problem.value(w) for w in wolves]
-
-    best_state = wolves[fitness.index(max(fitness))][:]
-    best_score = max(fitness)
-
-    for t in range(max_iter):
-        a = 2 - 2 * (t / max_iter)
-
-        sorted_wolves = sorted(zip(wolves, fitness), key=lambda x: x[1], reverse=True)
-        alpha, beta, delta = sorted_wolves[:3]
-        alpha, beta, delta = alpha[0], beta[0], delta[0]
-
-        new_wolves = []
-        for i in range(population_size):
-            wolf = wolves[i][:]
-            new = []
-            for j in range(problem.n):
-                r1, r2 = random.random(), random.random()
-                A1 = 2 * a * r1 - a
-                C1 = 2 * r2
-                D_alpha = abs(C1 * alpha[j] - wolf[j])
-                X1 = alpha[j] - A1 * D_alpha
-
-                r1, r2 = random.random(), random.random()
-                A2 = 2 * a * r1 - a
-                C2 = 2 * r2
-                D_beta = abs(C2 * beta[j] - wolf[j])
-                X2 = beta[j] - A2 * D_beta
-
-                r1, r2 = random.random(), random.random()
-                A3 = 2 * a * r1 - a
-                C3 = 2 * r2
-                D_delta = abs(C3 * delta[j] - wolf[j])
-                X3 = delta[j] - A3 * D_delta
-
-                X = (X1 + X2 + X3) / 3
-                new.append(int(max(0, min(problem.n - 1, X))))
-            new_wolves.append(new)
-
-        wolves = new_wolves
-        fitness = [problem.value(w) for w in wolves]
-
-        idx = fitness.index(max(fitness))
-        if fitness[idx] > best_score:
-            best_score = fitness[idx]
-            best_state = wolves[idx][:]
-
-        if best_score == 28:
-            break
-
-    return best_state, best_score
-
-
-# ------------------------
-# Hàm hỗ trợ
-# ------------------------
-def print_board(state):
-    n = len(state)
-    print("\nBàn cờ 8x8:")
-    print("  " + " ".join(str(i) for i in range(n)))
-    for row in range(n):
-        line = f"{row} "
-        for col in range(n):
-            line += "Q " if state[col] == row else ". "
-        print(line)
-
-
-def analyze(state, score):
-    print(f"Giá trị hàm đánh giá: {score}/28")
-    print_board(state)
-    if score == 28:
-        print("Đã tìm được lời giải hoàn hảo!")
-    else:
-        print("Chưa tìm được lời giải hoàn hảo.")
-
-
-# ------------------------
-# Main
-# ------------------------
-if __name__ == "__main__":
-    random.seed(42)
-    problem = EightQueensProblem()
-
-    print("=" * 60)
-    print("ANT COLONY OPTIMIZATION (ACO)")
-    print("=" * 60)
-    state, score = ant_colony_optimization(problem)
-    print(f"Kết quả: {state}")
-    analyze(state, score)
-
-    print("\n" + "=" * 60)
-    print("BEE COLONY (BCO)")
-    print("=" * 60)
-    state, score = bee_colony(problem)
-    print(f"Kết quả: {state}")
-    analyze(state, score)
-
-    print("\n" + "=" * 60)
-    print("GRAY WOLF OPTIMIZER (GWO)")
-    print("=" * 60)
-    state, score = gray_wolf_optimizer(problem)
-    print(f"Kết quả: {state}")
-    analyze(state, score)
+import os
+import sys
+import random
+import math
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.queens_eval import max_pairs, non_attacking_pairs
+from common.queens_batch import batch_values
+from common.instrument import Instrument, NULL_INSTRUMENT
+from common.progress import Clock, last
+from common.deadline import NO_DEADLINE
+
+# ------------------------
+# Bài toán 8 quân hậu
+# ------------------------
+class EightQueensProblem:
+    def __init__(self, n=8):
+        self.n = n
+        self.max_score = max_pairs(n)
+
+    def value(self, state):
+        return non_attacking_pairs(state)
+
+    def batch_value(self, population):
+        """value() của cả quần thể trong một lần tính NumPy, trả về list"""
+        return batch_values(population).tolist()
+
+    def is_attacking(self, state, i, j):
+        return (
+            state[i] == state[j] or
+            abs(state[i] - state[j]) == abs(i - j)
+        )
+
+    def random_state(self):
+        return [random.randint(0, self.n - 1) for _ in range(self.n)]
+
+
+# ------------------------
+# Ant Colony Optimization (ACO)
+# ------------------------
+def iter_ant_colony_optimization(problem, num_ants=30, max_iter=200, alpha=1, beta=2, rho=0.5, Q=100,
+                                 instrument=None, deadline=None):
+    """
+    ACO dạng generator: yield một Progress (common.progress) sau mỗi vòng
+    lặp, diversity tính trên các lời giải của đàn kiến vòng đó. Dừng sau
+    max_iter vòng hoặc khi đạt max_score; bên gọi có thể dừng sớm hơn.
+    """
+    probe = instrument or NULL_INSTRUMENT
+    deadline = deadline or NO_DEADLINE
+    clock = Clock()
+    n = problem.n
+    pheromone = [[1.0 for _ in range(n)] for _ in range(n)]
+
+    best_state = None
+    best_score = -1
+
+    for iteration in range(1, max_iter + 1):
+        solutions = []
+
+        with probe.phase('construct'):
+            for _ in range(num_ants):
+                state = []
+                for col in range(n):
+                    probs = [pheromone[col][row] ** alpha for row in range(n)]
+                    s = sum(probs)
+                    probs = [p / s for p in probs]
+                    row = random.choices(range(n), probs)[0]
+                    state.append(row)
+                solutions.append(state)
+
+        # Chấm điểm cả đàn kiến một lần
+        with probe.phase('evaluate'):
+            scores = problem.batch_value(solutions)
+            for state, score in zip(solutions, scores):
+                if score > best_score:
+                    best_state = state[:]
+                    best_score = score
+
+        with probe.phase('pheromone'):
+            # Bốc hơi pheromone
+            for col in range(n):
+                for row in range(n):
+                    pheromone[col][row] *= (1 - rho)
+
+            # Cập nhật pheromone
+            for state, score in zip(solutions, scores):
+                for col, row in enumerate(state):
+                    pheromone[col][row] += Q * (score / problem.max_score)
+
+        yield clock(iteration, best_state, best_score, solutions)
+        if best_score == problem.max_score or deadline.expired():
+            break
+
+
+def ant_colony_optimization(problem, num_ants=30, max_iter=200, alpha=1, beta=2, rho=0.5, Q=100,
+                            instrument=None, deadline=None):
+    progress = last(iter_ant_colony_optimization(problem, num_ants, max_iter, alpha, beta, rho, Q,
+                                                 instrument, deadline))
+    return (progress.best_state, progress.best_score) if progress else (None, -1)
+
+
+def conflict_heuristic(state):
+    """
+    eta[col][row] = 1 / (1 + số quân của state (trừ cột col) mà quân đặt ở
+    (col, row) sẽ tấn công). Dùng làm thành phần heuristic ** beta của ACO.
+    """
+    n = len(state)
+    best = np.asarray(state)
+    cols = np.arange(n)
+    R = np.bincount(best, minlength=n)
+    D = np.bincount(best - cols + n - 1, minlength=2 * n - 1)
+    A = np.bincount(best + cols, minlength=2 * n - 1)
+    rows = cols[None, :]
+    c = cols[:, None]
+    conflicts = R[rows] + D[rows - c + n - 1] + A[rows + c] - 3 * (rows == best[:, None])
+    return 1.0 / (1.0 + conflicts)
+
+
+def iter_ant_colony_optimization_vec(problem, num_ants=30, max_iter=200, alpha=1, beta=2, rho=0.5, Q=100,
+                                     instrument=None, deadline=None):
+    """
+    ACO vector hóa bằng NumPy, cùng tham số và cùng kiểu Progress với
+    iter_ant_colony_optimization.
+
+    - Mỗi vòng lặp chỉ tính một lần ma trận trọng số pheromone ** alpha * eta ** beta
+      rồi cộng dồn theo hàng thành CDF.
+    - Cả đàn kiến x mọi cột được lấy mẫu cùng lúc bằng CDF ngược trên một ma
+      trận số ngẫu nhiên đều (searchsorted trên CDF đã dời mỗi cột đi col).
+    - Bốc hơi và rải pheromone là phép toán mảng (np.add.at).
+    - beta có tác dụng thật: eta lấy từ conflict_heuristic của best_state hiện tại.
+    """
+    probe = instrument or NULL_INSTRUMENT
+    deadline = deadline or NO_DEADLINE
+    clock = Clock()
+    n = problem.n
+    rng = np.random.default_rng(random.randrange(2 ** 32))
+    cols = np.arange(n)
+    pheromone = np.ones((n, n))
+    eta = np.ones((n, n))
+
+    best_state = None
+    best_score = -1
+
+    for iteration in range(1, max_iter + 1):
+        with probe.phase('construct'):
+            weights = pheromone ** alpha * eta ** beta
+            cdf = np.cumsum(weights, axis=1)
+            cdf /= cdf[:, -1:]
+            # Hàng col của CDF nằm trong (col, col + 1] sau khi dời, nên cả ma trận
+            # phẳng tăng dần và một lần searchsorted chọn hàng cho mọi (kiến, cột)
+            shifted = (cdf + cols[:, None]).ravel()
+            u = rng.random((num_ants, n)) + cols
+            solutions = np.searchsorted(shifted, u, side='right') - cols * n
+            np.clip(solutions, 0, n - 1, out=solutions)
+
+        with probe.phase('evaluate'):
+            scores = np.asarray(problem.batch_value(solutions))
+            i = int(scores.argmax())
+            if scores[i] > best_score:
+                best_score = int(scores[i])
+                best_state = solutions[i].tolist()
+                eta = conflict_heuristic(best_state)
+
+        with probe.phase('pheromone'):
+            pheromone *= (1 - rho)
+            deposit = np.broadcast_to((Q * scores / problem.max_score)[:, None], solutions.shape)
+            np.add.at(pheromone, (np.broadcast_to(cols, solutions.shape), solutions), deposit)
+
+        yield clock(iteration, best_state, best_score, solutions)
+        if best_score == problem.max_score or deadline.expired():
+            break
+
+
+def ant_colony_optimization_vec(problem, num_ants=30, max_iter=200, alpha=1, beta=2, rho=0.5, Q=100,
+                                instrument=None, deadline=None):
+    progress = last(iter_ant_colony_optimization_vec(problem, num_ants, max_iter, alpha, beta, rho, Q,
+                                                     instrument, deadline))
+    return (progress.best_state, progress.best_score) if progress else (None, -1)
+
+
+# ------------------------
+# Artificial Bee Colony (ABC)
+# ------------------------
+def _bee_neighbor(problem, population, i):
+    """Ứng viên mới của ong i: lấy một gen ngẫu nhiên từ một con khác (hoặc giữ nguyên)"""
+    k = random.randint(0, len(population) - 1)
+    while k == i:
+        k = random.randint(0, len(population) - 1)
+    j = random.randint(0, problem.n - 1)
+    new = population[i][:]
+    new[j] = population[i][j] if random.random() > 0.5 else population[k][j]
+    return new
+
+
+def iter_bee_colony(problem, population_size=30, max_iter=200, limit=50, instrument=None, deadline=None):
+    """
+    ABC dạng generator: yield Progress cho quần thể ban đầu rồi sau mỗi vòng lặp.
+    Mỗi ong được chấm điểm và cập nhật ngay, ong sau thấy kết quả của ong trước.
+    """
+    probe = instrument or NULL_INSTRUMENT
+    deadline = deadline or NO_DEADLINE
+    clock = Clock()
+    population = [problem.random_state() for _ in range(population_size)]
+    fitness = problem.batch_value(population)
+    trial = [0] * population_size
+
+    best_state = population[fitness.index(max(fitness))][:]
+    best_score = max(fitness)
+    yield clock(0, best_state, best_score, population)
+
+    def visit(i):
+        new = _bee_neighbor(problem, population, i)
+        new_score = problem.value(new)
+        if new_score > fitness[i]:
+            population[i] = new
+            fitness[i] = new_score
+            trial[i] = 0
+        else:
+            trial[i] += 1
+
+    for iteration in range(1, max_iter + 1):
+        # Employed bees
+        with probe.phase('employed'):
+            for i in range(population_size):
+                visit(i)
+
+        # Onlooker bees
+        with probe.phase('onlooker'):
+            probs = [f / sum(fitness) for f in fitness]
+            for _ in range(population_size):
+                visit(random.choices(range(population_size), probs)[0])
+
+        # Scout bees
+        with probe.phase('scout'):
+            for i in range(population_size):
+                if trial[i] > limit:
+                    population[i] = problem.random_state()
+                    fitness[i] = problem.value(population[i])
+                    trial[i] = 0
+
+        # Cập nhật best
+        idx = fitness.index(max(fitness))
+        if fitness[idx] > best_score:
+            best_score = fitness[idx]
+            best_state = population[idx][:]
+
+        yield clock(iteration, best_state, best_score, population)
+        if best_score == problem.max_score or deadline.expired():
+            break
+
+
+def bee_colony(problem, population_size=30, max_iter=200, limit=50, instrument=None, deadline=None):
+    progress = last(iter_bee_colony(problem, population_size, max_iter, limit, instrument, deadline))
+    return progress.best_state, progress.best_score
+
+
+def iter_bee_colony_sync(problem, population_size=30, max_iter=200, limit=50, instrument=None, deadline=None):
+    """
+    Biến thể đồng bộ của iter_bee_colony: ứng viên của cả một pha sinh từ
+    quần thể đầu pha rồi được chấm điểm chung một lần bằng batch_value
+    (NumPy). Quỹ đạo khác bản tuần tự với cùng seed.
+    """
+    probe = instrument or NULL_INSTRUMENT
+    deadline = deadline or NO_DEADLINE
+    clock = Clock()
+    population = [problem.random_state() for _ in range(population_size)]
+    fitness = problem.batch_value(population)
+    trial = [0] * population_size
+
+    best_state = population[fitness.index(max(fitness))][:]
+    best_score = max(fitness)
+    yield clock(0, best_state, best_score, population)
+
+    def accept(chosen, candidates):
+        for i, new, new_score in zip(chosen, candidates, problem.batch_value(candidates)):
+            if new_score > fitness[i]:
+                population[i] = new
+                fitness[i] = new_score
+                trial[i] = 0
+            else:
+                trial[i] += 1
+
+    for iteration in range(1, max_iter + 1):
+        with probe.phase('employed'):
+            chosen = list(range(population_size))
+            accept(chosen, [_bee_neighbor(problem, population, i) for i in chosen])
+
+        with probe.phase('onlooker'):
+            probs = [f / sum(fitness) for f in fitness]
+            chosen = [random.choices(range(population_size), probs)[0] for _ in range(population_size)]
+            accept(chosen, [_bee_neighbor(problem, population, i) for i in chosen])
+
+        with probe.phase('scout'):
+            scouts = [i for i in range(population_size) if trial[i] > limit]
+            if scouts:
+                for i in scouts:
+                    population[i] = problem.random_state()
+                    trial[i] = 0
+                for i, score in zip(scouts, problem.batch_value([population[i] for i in scouts])):
+                    fitness[i] = score
+
+        idx = fitness.index(max(fitness))
+        if fitness[idx] > best_score:
+            best_score = fitness[idx]
+            best_state = population[idx][:]
+
+        yield clock(iteration, best_state, best_score, population)
+        if best_score == problem.max_score or deadline.expired():
+            break
+
+
+def bee_colony_sync(problem, population_size=30, max_iter=200, limit=50, instrument=None, deadline=None):
+    progress = last(iter_bee_colony_sync(problem, population_size, max_iter, limit, instrument, deadline))
+    return progress.best_state, progress.best_score
+
+
+# ------------------------
+# Gray Wolf Optimizer (GWO)
+# ------------------------
+def iter_gray_wolf_optimizer(problem, population_size=30, max_iter=200, instrument=None, deadline=None):
+    """GWO dạng generator: yield Progress cho bầy ban đầu rồi sau mỗi vòng lặp"""
+    probe = instrument or NULL_INSTRUMENT
+    deadline = deadline or NO_DEADLINE
+    clock = Clock()
+    wolves = [problem.random_state() for _ in range(population_size)]
+    fitness = problem.batch_value(wolves)
+
+    best_state = wolves[fitness.index(max(fitness))][:]
+    best_score = max(fitness)
+    yield clock(0, best_state, best_score, wolves)
+
+    for t in range(max_iter):
+        a = 2 - 2 * (t / max_iter)
+
+        with probe.phase('leaders'):
+            sorted_wolves = sorted(zip(wolves, fitness), key=lambda x: x[1], reverse=True)
+            alpha, beta, delta = sorted_wolves[:3]
+            alpha, beta, delta = alpha[0], beta[0], delta[0]
+
+        with probe.phase('update'):
+            new_wolves = []
+            for i in range(population_size):
+                wolf = wolves[i][:]
+                new = []
+                for j in range(problem.n):
+                    r1, r2 = random.random(), random.random()
+                    A1 = 2 * a * r1 - a
+                    C1 = 2 * r2
+                    D_alpha = abs(C1 * alpha[j] - wolf[j])
+                    X1 = alpha[j] - A1 * D_alpha
+
+                    r1, r2 = random.random(), random.random()
+                    A2 = 2 * a * r1 - a
+                    C2 = 2 * r2
+                    D_beta = abs(C2 * beta[j] - wolf[j])
+                    X2 = beta[j] - A2 * D_beta
+
+                    r1, r2 = random.random(), random.random()
+                    A3 = 2 * a * r1 - a
+                    C3 = 2 * r2
+                    D_delta = abs(C3 * delta[j] - wolf[j])
+                    X3 = delta[j] - A3 * D_delta
+
+                    X = (X1 + X2 + X3) / 3
+                    new.append(int(max(0, min(problem.n - 1, X))))
+                new_wolves.append(new)
+
+        wolves = new_wolves
+        with probe.phase('evaluate'):
+            fitness = problem.batch_value(wolves)
+
+        idx = fitness.index(max(fitness))
+        if fitness[idx] > best_score:
+            best_score = fitness[idx]
+            best_state = wolves[idx][:]
+
+        yield clock(t + 1, best_state, best_score, wolves)
+        if best_score == problem.max_score or deadline.expired():
+            break
+
+
+def gray_wolf_optimizer(problem, population_size=30, max_iter=200, instrument=None, deadline=None):
+    progress = last(iter_gray_wolf_optimizer(problem, population_size, max_iter, instrument, deadline))
+    return progress.best_state, progress.best_score
+
+
+# ------------------------
+# Hàm hỗ trợ
+# ------------------------
+def print_board(state):
+    n = len(state)
+    print(f"\nBàn cờ {n}x{n}:")
+    print("  " + " ".join(str(i) for i in range(n)))
+    for row in range(n):
+        line = f"{row} "
+        for col in range(n):
+            line += "Q " if state[col] == row else ". "
+        print(line)
+
+
+def analyze(state, score):
+    max_score = max_pairs(len(state))
+    print(f"Giá trị hàm đánh giá: {score}/{max_score}")
+    print_board(state)
+    if score == max_score:
+        print("Đã tìm được lời giải hoàn hảo!")
+    else:
+        print("Chưa tìm được lời giải hoàn hảo.")
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    random.seed(42)
+    problem = EightQueensProblem()
+
+    print("=" * 60)
+    print("ANT COLONY OPTIMIZATION (ACO)")
+    print("=" * 60)
+    state, score = ant_colony_optimization(problem)
+    print(f"Kết quả: {state}")
+    analyze(state, score)
+
+    print("\n" + "=" * 60)
+    print("BEE COLONY (BCO)")
+    print("=" * 60)
+    state, score = bee_colony(problem)
+    print(f"Kết quả: {state}")
+    analyze(state, score)
+
+    print("\n" + "=" * 60)
+    print("GRAY WOLF OPTIMIZER (GWO)")
+    print("=" * 60)
+    state, score = gray_wolf_optimizer(problem)
+    print(f"Kết quả: {state}")
+    analyze(state, score)
+
+    # Đếm số lần đánh giá và thời gian từng pha của ACO (bản vector hóa)
+    print("\n" + "=" * 60)
+    print("ACO (VECTOR HÓA) CÓ ĐO ĐẠC")
+    print("=" * 60)
+    instrument = Instrument()
+    instrument.attach(problem)
+    state, score = ant_colony_optimization_vec(problem, instrument=instrument)
+    instrument.detach(problem)
+    analyze(state, score)
+    print(instrument)
+
+    # Theo dõi hội tụ của ABC từng vòng, tự dừng khi 30 vòng liền không cải thiện
+    print("\n" + "=" * 60)
+    print("BEE COLONY - THEO DÕI TỪNG VÒNG")
+    print("=" * 60)
+    best_score, improved_at = -1, 0
+    for progress in iter_bee_colony(EightQueensProblem(n=12), max_iter=500):
+        if progress.iteration % 25 == 0:
+            print(f"Vòng {progress.iteration:3}: điểm {progress.best_score}, "
+                  f"đa dạng {progress.diversity:.2f}, {progress.elapsed:.3f}s")
+        if progress.best_score > best_score:
+            best_score, improved_at = progress.best_score, progress.iteration
+        elif progress.iteration - improved_at >= 30:
+            print(f"Dừng ở vòng {progress.iteration}: 30 vòng không cải thiện")
+            break
+    analyze(progress.best_state, progress.best_score)
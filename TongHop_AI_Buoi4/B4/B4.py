@@ -1,77 +1,134 @@
-from easyAI import TwoPlayerGame, AI_Player, Human_Player, Negamax
-
-class TicTacToe(TwoPlayerGame):
-    def __init__(self, players):
-        self.players = players
-        self.board = [0] * 9
-        self.current_player = 1  # Người chơi đầu tiên
-
-    def possible_moves(self):
-        return [i for i, v in enumerate(self.board) if v == 0]
-
-    def make_move(self, move):
-        self.board[move] = self.current_player
-
-    def unmake_move(self, move):
-        self.board[move] = 0
-
-    def lose(self):
-        """Kiểm tra nếu người chơi hiện tại thua"""
-        wins = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # hàng ngang
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # hàng dọc
-            [0, 4, 8], [2, 4, 6]              # đường chéo
-        ]
-        opponent = 3 - self.current_player
-        return any(all(self.board[i] == opponent for i in line) for line in wins)
-    
-    def win(self):
-        """Kiểm tra nếu người chơi hiện tại thắng"""
-        wins = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],
-            [0, 4, 8], [2, 4, 6]
-        ]
-        return any(all(self.board[i] == self.current_player for i in line) for line in wins)
-
-    def is_over(self):
-        return self.win() or self.lose() or not any(v == 0 for v in self.board)
-
-    def show(self):
-        symbols = ['.', 'X', 'O']
-        print("\n  +---+---+---+")
-        for i in range(3):
-            row = " | ".join(symbols[self.board[3*i + j]] for j in range(3))
-            print(f"  | {row} |")
-            print("  +---+---+---+")
-        
-        current_symbol = symbols[self.current_player]
-        print(f"Lượt người chơi {self.current_player} ('{current_symbol}')")
-        print()
-
-    def scoring(self):
-        """Hàm đánh giá cho minimax"""
-        if self.win():
-            return 100  # Thắng
-        if self.lose():
-            return -100  # Thua
-        return 0  # Hòa hoặc chưa kết thúc
-
-if __name__ == "__main__":
-    # Sử dụng Negamax với depth=9
-    ai_algo = Negamax(9)
-    
-    print("Tic Tac Toe với Minimax và Alpha-Beta Pruning")
-    print("Bạn là 'O', AI là 'X'")
-    print("Nhập số từ 0-8 tương ứng với vị trí:")
-    print("  0 | 1 | 2")
-    print("  3 | 4 | 5")
-    print("  6 | 7 | 8")
-    print()
-    
-    # Tạo game với AI đi trước (player 1)
-    game = TicTacToe([Human_Player(),AI_Player(ai_algo)])
-    
-    # Bắt đầu game
-    game.play()
+import copy
+import os
+import sys
+
+from easyAI import TwoPlayerGame, AI_Player, Human_Player, Negamax
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.deadline import Deadline, DeadlineExceeded
+
+WIN_LINES = [
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],  # hàng ngang
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],  # hàng dọc
+    [0, 4, 8], [2, 4, 6]              # đường chéo
+]
+# Mỗi đường thắng dưới dạng bitmask 9 bit (bit i = ô i)
+WIN_MASKS = [sum(1 << i for i in line) for line in WIN_LINES]
+
+
+def has_line(mask):
+    """mask (bitmask các ô của một người chơi) có chứa trọn một đường thắng không"""
+    return any(mask & w == w for w in WIN_MASKS)
+
+
+class TicTacToe(TwoPlayerGame):
+    def __init__(self, players):
+        self.players = players
+        self.board = [0] * 9
+        self.current_player = 1  # Người chơi đầu tiên
+
+    def possible_moves(self):
+        return [i for i, v in enumerate(self.board) if v == 0]
+
+    def make_move(self, move):
+        self.board[move] = self.current_player
+
+    def unmake_move(self, move):
+        self.board[move] = 0
+
+    def mask(self, player):
+        """Bitmask các ô của player"""
+        return sum(1 << i for i, v in enumerate(self.board) if v == player)
+
+    def lose(self):
+        """Kiểm tra nếu người chơi hiện tại thua"""
+        return has_line(self.mask(3 - self.current_player))
+    
+    def win(self):
+        """Kiểm tra nếu người chơi hiện tại thắng"""
+        return has_line(self.mask(self.current_player))
+
+    def is_over(self):
+        return self.win() or self.lose() or not any(v == 0 for v in self.board)
+
+    def show(self):
+        symbols = ['.', 'X', 'O']
+        print("\n  +---+---+---+")
+        for i in range(3):
+            row = " | ".join(symbols[self.board[3*i + j]] for j in range(3))
+            print(f"  | {row} |")
+            print("  +---+---+---+")
+        
+        current_symbol = symbols[self.current_player]
+        print(f"Lượt người chơi {self.current_player} ('{current_symbol}')")
+        print()
+
+    def scoring(self):
+        """Hàm đánh giá cho minimax"""
+        if self.win():
+            return 100  # Thắng
+        if self.lose():
+            return -100  # Thua
+        return 0  # Hòa hoặc chưa kết thúc
+
+
+class TimedNegamax:
+    """
+    Negamax của easyAI có giới hạn thời gian mỗi nước:
+    AI_Player(TimedNegamax(9, time_limit=0.5)).
+
+    Lặp sâu dần depth = 1..max_depth, mỗi độ sâu gọi Negamax(depth) trên một
+    bản sao của game với hàm scoring kiểm tra deadline ở các lá; hết giờ thì
+    DeadlineExceeded cắt ngang lần tìm đang dở (bản sao bị bỏ đi) và trả về
+    nước của độ sâu trọn vẹn cuối cùng (self.depth), hoặc nước đầu tiên nếu
+    chưa xong độ sâu nào. deadline (tùy chọn) là giới hạn chung cho cả ván,
+    bao ngoài time_limit của từng nước.
+    """
+
+    def __init__(self, max_depth=9, time_limit=1.0, deadline=None):
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.deadline = deadline
+        self.depth = 0
+
+    def __deepcopy__(self, memo):
+        # play() deepcopy cả game sau mỗi nước; AI không thuộc trạng thái ván cờ
+        return self
+
+    def __call__(self, game):
+        deadline = Deadline(self.time_limit, parent=self.deadline)
+
+        def scoring(g):
+            deadline.check()
+            return g.scoring()
+
+        best, self.depth = game.possible_moves()[0], 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best = Negamax(depth, scoring=scoring)(copy.deepcopy(game))
+            except DeadlineExceeded:
+                break
+            self.depth = depth
+        return best
+
+
+if __name__ == "__main__":
+    # Bảng negamax đầy đủ (đã gộp 8 phép đối xứng): mỗi nước đi của AI chỉ là
+    # vài lần tra bảng. Negamax(9) của easyAI vẫn dùng được thay thế.
+    from tictactoe_solver import TableAI
+    ai_algo = TableAI()
+    
+    print("Tic Tac Toe với Minimax và Alpha-Beta Pruning")
+    print("Bạn là 'O', AI là 'X'")
+    print("Nhập số từ 0-8 tương ứng với vị trí:")
+    print("  0 | 1 | 2")
+    print("  3 | 4 | 5")
+    print("  6 | 7 | 8")
+    print()
+    
+    # Tạo game với AI đi trước (player 1)
+    game = TicTacToe([Human_Player(),AI_Player(ai_algo)])
+    
+    # Bắt đầu game
+    game.play()
     print("Game over!")
\ No newline at end of file
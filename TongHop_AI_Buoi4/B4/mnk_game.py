@@ -0,0 +1,319 @@
+import os
+import sys
+import random
+import time
+
+from easyAI import TwoPlayerGame, AI_Player, Human_Player
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.deadline import NO_DEADLINE
+
+WIN = 1000000
+
+
+# ------------------------
+# Trò chơi m,n,k trên bitboard
+# ------------------------
+class MNKGame(TwoPlayerGame):
+    """
+    Trò chơi m,n,k: bàn m hàng x n cột, ai xếp được k quân liên tiếp (ngang,
+    dọc, chéo) trước thì thắng. MNKGame(players) là tic-tac-toe 3,3,3;
+    MNKGame(players, 15, 15, 5) là gomoku.
+
+    Quân của mỗi người là một số nguyên (bitboard): ô (r, c) ứng với bit
+    r * (n + 1) + c. Cột phụ thứ n luôn trống nên khi dịch bit theo hướng
+    ngang/chéo không bị tràn sang hàng khác.
+
+    Nước đi là chỉ số ô r * n + c (0..m*n-1) như B4.TicTacToe. Thắng được
+    kiểm tra tăng dần từ nước vừa đi (O(k)); hash Zobrist cũng được cập nhật
+    tăng dần trong make_move/unmake_move để AlphaBeta dùng bảng chuyển vị.
+    """
+
+    def __init__(self, players, m=3, n=3, k=3, seed=0):
+        self.players = players
+        self.m, self.n, self.k = m, n, k
+        self.width = n + 1
+        self.cells = [1 << (r * self.width + c) for r in range(m) for c in range(n)]
+        self.index = {bit.bit_length() - 1: move for move, bit in enumerate(self.cells)}
+        self.valid = sum(self.cells)
+        self.directions = (1, self.width, self.width + 1, self.width - 1)
+
+        rng = random.Random(seed)
+        self.zobrist = [None] + [[rng.getrandbits(64) for _ in self.cells] for _ in range(2)]
+        self.side_key = rng.getrandbits(64)
+
+        self.bits = [0, 0, 0]  # bits[1], bits[2]: bitboard của hai người chơi
+        self.hash = 0
+        self.winner = 0
+        self.empty = m * n
+        self.current_player = 1  # Người chơi đầu tiên
+
+    # --- Giao diện TwoPlayerGame ---
+    def possible_moves(self):
+        free = self.valid & ~(self.bits[1] | self.bits[2])
+        return [move for move, bit in enumerate(self.cells) if free & bit]
+
+    def make_move(self, move):
+        player = self.current_player
+        self.bits[player] |= self.cells[move]
+        self.hash ^= self.zobrist[player][move] ^ self.side_key
+        self.empty -= 1
+        if self.is_winning_move(player, move):
+            self.winner = player
+
+    def unmake_move(self, move):
+        bit = self.cells[move]
+        player = 1 if self.bits[1] & bit else 2
+        self.bits[player] &= ~bit
+        self.hash ^= self.zobrist[player][move] ^ self.side_key
+        self.empty += 1
+        self.winner = 0  # chỉ đi tiếp khi chưa ai thắng
+
+    def lose(self):
+        """Đối thủ vừa tạo được k quân liên tiếp"""
+        return self.winner == 3 - self.current_player
+
+    def win(self):
+        return self.winner == self.current_player
+
+    def is_over(self):
+        return self.winner != 0 or self.empty == 0
+
+    def scoring(self):
+        """Điểm theo góc nhìn người sắp đi: thua thật rất âm, còn lại dùng evaluate"""
+        if self.lose():
+            return -(WIN + self.empty)
+        return self.evaluate(self.current_player) - self.evaluate(3 - self.current_player)
+
+    def show(self):
+        symbols = ['.', 'X', 'O']
+        print("\n    " + " ".join(f"{c:2}" for c in range(self.n)))
+        for r in range(self.m):
+            row = []
+            for c in range(self.n):
+                bit = self.cells[r * self.n + c]
+                row.append(symbols[1] if self.bits[1] & bit else symbols[2] if self.bits[2] & bit else symbols[0])
+            print(f"{r:3} " + " ".join(f"{s:>2}" for s in row))
+        print(f"Lượt người chơi {self.current_player} ('{symbols[self.current_player]}')")
+        print()
+
+    # --- Bitboard ---
+    def is_winning_move(self, player, move):
+        """Đếm quân liên tiếp qua ô vừa đi theo 4 hướng, dừng khi đủ k"""
+        bits = self.bits[player]
+        pos = self.cells[move].bit_length() - 1
+        for d in self.directions:
+            run = 1
+            p = pos + d
+            while bits >> p & 1:
+                run += 1
+                p += d
+            p = pos - d
+            while p >= 0 and bits >> p & 1:
+                run += 1
+                p -= d
+            if run >= self.k:
+                return True
+        return False
+
+    def evaluate(self, player):
+        """
+        Heuristic: với mỗi hướng và mỗi độ dài L < k, đếm số chuỗi L quân liên
+        tiếp (bằng phép AND các bản dịch bit), cộng 4^L cho mỗi chuỗi.
+        """
+        bits = self.bits[player]
+        score = 0
+        for d in self.directions:
+            run = bits
+            for length in range(2, self.k):
+                run &= bits >> (d * (length - 1))
+                if not run:
+                    break
+                score += 4 ** length * bin(run).count('1')
+        return score
+
+    def candidate_moves(self):
+        """
+        Nước đi đáng xét: trên bàn nhỏ (<= 25 ô) là mọi ô trống, trên bàn lớn
+        chỉ các ô trống kề (8 hướng) một quân đã đặt; bàn trống thì đi giữa.
+        """
+        stones = self.bits[1] | self.bits[2]
+        free = self.valid & ~stones
+        if self.m * self.n > 25:
+            if not stones:
+                return [(self.m // 2) * self.n + self.n // 2]
+            near = stones
+            for d in self.directions:
+                near |= stones << d | stones >> d
+            free &= near
+        moves = []
+        while free:
+            bit = free & -free
+            free ^= bit
+            moves.append(self.index[bit.bit_length() - 1])
+        return moves
+
+
+# ------------------------
+# Alpha-beta lặp sâu dần có giới hạn thời gian
+# ------------------------
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class _Timeout(Exception):
+    pass
+
+
+class AlphaBeta:
+    """
+    AI cho easyAI: AI_Player(AlphaBeta(time_limit=1.0)).
+
+    Negamax alpha-beta lặp sâu dần (độ sâu 1, 2, ...) tới khi hết time_limit
+    giây hoặc đạt max_depth; trả về nước tốt nhất của lần lặp trọn vẹn cuối.
+    Bảng chuyển vị khóa theo game.hash (Zobrist) lưu (độ sâu, giá trị, loại
+    cận, nước tốt nhất); nước tốt nhất trong bảng được xét trước, các nước
+    còn lại xếp theo số quân kề bên. Bảng được giữ giữa các nước đi và xóa
+    khi vượt max_entries. deadline (common.deadline, tùy chọn) là giới hạn
+    chung bao ngoài time_limit, ví dụ thời gian cho cả ván hoặc để hủy từ
+    bên ngoài; hết hạn thì trả về nước của độ sâu trọn vẹn cuối như khi hết
+    time_limit.
+    """
+
+    def __init__(self, time_limit=1.0, max_depth=None, max_entries=1000000, deadline=None):
+        self.time_limit = time_limit
+        self.deadline = deadline or NO_DEADLINE
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self.table = {}
+        self.nodes = 0
+        self.depth = 0
+
+    def __deepcopy__(self, memo):
+        # TwoPlayerGame.play() deepcopy cả game (kể cả players) sau mỗi nước;
+        # bộ máy tìm kiếm và bảng chuyển vị không thuộc trạng thái ván cờ
+        return self
+
+    def __call__(self, game):
+        if len(self.table) > self.max_entries:
+            self.table.clear()
+        self.stop_at = time.perf_counter() + self.time_limit
+        self.nodes = 0
+        moves = game.candidate_moves()
+        best = moves[0]
+        max_depth = self.max_depth or game.empty
+        for depth in range(1, max_depth + 1):
+            try:
+                value, move = self._root(game, depth, moves)
+            except _Timeout:
+                break
+            best, self.depth = move, depth
+            if abs(value) >= WIN:
+                break  # đã thấy thắng/thua chắc chắn
+        return best
+
+    def _root(self, game, depth, moves):
+        entry = self.table.get(game.hash)
+        ordered = self._order(game, moves, entry[3] if entry else None)
+        alpha, best = -2 * WIN, ordered[0]
+        for move in ordered:
+            value = -self._play(game, move, depth - 1, -2 * WIN, -alpha)
+            if value > alpha:
+                alpha, best = value, move
+        self.table[game.hash] = (depth, alpha, EXACT, best)
+        return alpha, best
+
+    def _play(self, game, move, depth, alpha, beta):
+        game.make_move(move)
+        game.switch_player()
+        try:
+            return self._search(game, depth, alpha, beta)
+        finally:
+            game.switch_player()
+            game.unmake_move(move)
+
+    def _search(self, game, depth, alpha, beta):
+        self.nodes += 1
+        if not self.nodes & 255 and (time.perf_counter() > self.stop_at or self.deadline.expired()):
+            raise _Timeout
+        if game.winner:
+            return -(WIN + game.empty)
+        if game.empty == 0:
+            return 0
+        if depth == 0:
+            return game.scoring()
+
+        entry = self.table.get(game.hash)
+        tt_move = None
+        if entry is not None:
+            e_depth, e_value, flag, tt_move = entry
+            if e_depth >= depth:
+                if flag == EXACT:
+                    return e_value
+                if flag == LOWER:
+                    alpha = max(alpha, e_value)
+                else:
+                    beta = min(beta, e_value)
+                if alpha >= beta:
+                    return e_value
+
+        start_alpha = alpha
+        best_value, best_move = -2 * WIN, None
+        for move in self._order(game, game.candidate_moves(), tt_move):
+            value = -self._play(game, move, depth - 1, -beta, -alpha)
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = UPPER if best_value <= start_alpha else LOWER if best_value >= beta else EXACT
+        self.table[game.hash] = (depth, best_value, flag, best_move)
+        return best_value
+
+    @staticmethod
+    def _order(game, moves, first=None):
+        """Nước trong bảng chuyển vị trước, sau đó theo số quân kề bên giảm dần"""
+        stones = game.bits[1] | game.bits[2]
+        width = game.width
+
+        def crowd(move):
+            pos = game.cells[move].bit_length() - 1
+            near = 0
+            for d in (1, width - 1, width, width + 1):
+                near += (stones >> (pos + d) & 1) + (pos >= d and stones >> (pos - d) & 1)
+            return -near
+
+        ordered = sorted(moves, key=crowd)
+        if first is not None and first in ordered:
+            ordered.remove(first)
+            ordered.insert(0, first)
+        return ordered
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Demo m,n,k-game: AI đấu AI, --play để chơi gomoku với AI")
+    parser.add_argument('--play', action='store_true', help="chơi gomoku 15x15 với AI sau phần demo")
+    args = parser.parse_args()
+
+    for (m, n, k), limit in (((3, 3, 3), 1.0), ((4, 4, 3), 1.0), ((9, 9, 5), 0.5)):
+        game = MNKGame([AI_Player(AlphaBeta(limit)), AI_Player(AlphaBeta(limit))], m, n, k)
+        start = time.perf_counter()
+        game.play(verbose=False)
+        if game.lose():
+            result = f"người chơi {3 - game.current_player} thắng"
+        else:
+            result = "hòa"
+        print(f"m,n,k = {m},{n},{k}: {result} sau {game.nmove - 1} nước "
+              f"({time.perf_counter() - start:.2f}s)")
+        game.show()
+
+    # Người chơi với AI trên bàn gomoku 15x15 (nước đi = hàng * 15 + cột)
+    if args.play:
+        game = MNKGame([Human_Player(), AI_Player(AlphaBeta(time_limit=2.0))], 15, 15, 5)
+        game.play()
+        print("Game over!")
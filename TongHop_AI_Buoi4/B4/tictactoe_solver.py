@@ -0,0 +1,137 @@
+from B4 import has_line
+
+FULL = (1 << 9) - 1
+
+
+# ------------------------
+# 8 phép đối xứng của bàn 3x3
+# ------------------------
+def _compose(p, q):
+    """Hoán vị 'áp q rồi áp p': ô i của bàn mới lấy từ ô q[p[i]] của bàn cũ"""
+    return [q[p[i]] for i in range(9)]
+
+
+_ROTATE = [6, 3, 0, 7, 4, 1, 8, 5, 2]  # quay 90 độ theo chiều kim đồng hồ
+_FLIP = [2, 1, 0, 5, 4, 3, 8, 7, 6]    # lật ngang
+
+SYMMETRIES = []
+_p = list(range(9))
+for _ in range(4):
+    SYMMETRIES.append(_p)
+    SYMMETRIES.append(_compose(_FLIP, _p))
+    _p = _compose(_ROTATE, _p)
+
+# SYMMETRY_MAPS[s][mask]: bitmask mask sau phép đối xứng s (tra bảng 512 phần tử)
+SYMMETRY_MAPS = [
+    [sum(1 << i for i in range(9) if mask >> perm[i] & 1) for mask in range(1 << 9)]
+    for perm in SYMMETRIES
+]
+
+
+def canonical(me, opp):
+    """
+    Khóa chuẩn của thế cờ: me là bitmask quân của người sắp đi, opp của đối
+    thủ. Lấy giá trị nhỏ nhất qua 8 phép đối xứng, nên các thế cờ đối xứng
+    (và cùng vai trò người đi) dùng chung một ô trong bảng.
+    """
+    return min(m[me] << 9 | m[opp] for m in SYMMETRY_MAPS)
+
+
+# ------------------------
+# Negamax với bảng chuyển vị
+# ------------------------
+def negamax(me, opp, table):
+    """
+    Giá trị thế cờ với người sắp đi (me): > 0 thắng, 0 hòa, < 0 thua.
+    Thắng/thua càng sớm thì trị tuyệt đối càng lớn (1 + số ô trống còn lại),
+    để AI chọn thắng nhanh và kéo dài khi thua.
+    """
+    key = canonical(me, opp)
+    value = table.get(key)
+    if value is not None:
+        return value
+    free = FULL & ~(me | opp)
+    if has_line(opp):
+        value = -(1 + bin(free).count('1'))
+    elif not free:
+        value = 0
+    else:
+        value = -100
+        while free:
+            bit = free & -free
+            free ^= bit
+            value = max(value, -negamax(opp, me | bit, table))
+    table[key] = value
+    return value
+
+
+_TABLE = None
+
+
+def get_table():
+    """Bảng giá trị mọi thế cờ đi được từ bàn trống, dựng một lần mỗi process"""
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = {}
+        negamax(0, 0, _TABLE)
+    return _TABLE
+
+
+def best_move(board, player):
+    """
+    Nước đi tốt nhất (chỉ số ô 0..8) cho player trên board dạng list 9 ô
+    như TicTacToe.board. Mỗi nước chỉ cần tối đa 9 lần tra bảng; hòa điểm thì
+    chọn ô có chỉ số nhỏ nhất.
+    """
+    table = get_table()
+    me = sum(1 << i for i, v in enumerate(board) if v == player)
+    opp = sum(1 << i for i, v in enumerate(board) if v == 3 - player)
+    best, best_value = None, None
+    for i in range(9):
+        if board[i] == 0:
+            value = -negamax(opp, me | 1 << i, table)
+            if best_value is None or value > best_value:
+                best, best_value = i, value
+    return best
+
+
+class TableAI:
+    """
+    Thuật toán cho easyAI: AI_Player(TableAI()) chơi hoàn hảo bằng cách tra
+    bảng negamax thay vì tìm kiếm lại cả cây như Negamax(9).
+    """
+
+    def __init__(self):
+        get_table()
+
+    def __call__(self, game):
+        return best_move(game.board, game.current_player)
+
+
+# ------------------------
+# Main
+# ------------------------
+if __name__ == "__main__":
+    import time
+    from easyAI import AI_Player, Negamax
+    from B4 import TicTacToe, TimedNegamax
+
+    start = time.perf_counter()
+    table = get_table()
+    print(f"Bảng negamax: {len(table)} thế cờ chuẩn (sau khi gộp đối xứng), "
+          f"dựng trong {time.perf_counter() - start:.3f}s")
+    print(f"Giá trị bàn trống: {table[canonical(0, 0)]} (0 = hòa khi cả hai chơi hoàn hảo)")
+
+    for name, first, second in (
+        ("TableAI vs TableAI", TableAI(), TableAI()),
+        ("Negamax(9) vs TableAI", Negamax(9), TableAI()),
+        ("TimedNegamax(9, 0.05s) vs TableAI", TimedNegamax(9, time_limit=0.05), TableAI()),
+    ):
+        game = TicTacToe([AI_Player(first), AI_Player(second)])
+        start = time.perf_counter()
+        game.play(verbose=False)
+        if game.lose():
+            result = f"người chơi {3 - game.current_player} thắng"
+        else:
+            result = "hòa"
+        print(f"{name}: {result}, {game.nmove - 1} nước, {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,417 @@
+"""
+Benchmark chung cho các thuật toán B1-B4.
+
+Mỗi thuật toán chạy trên một tập instance sinh từ seed (cùng seed thì cùng
+instance), ở nhiều kích thước, lặp lại --repeat lần. Ghi lại thời gian,
+số lần đánh giá, số node mở rộng, tỉ lệ thành công, thời gian từng pha của
+solver (nếu solver nhận instrument) và bộ nhớ đỉnh (tracemalloc, đo trong
+một lần chạy riêng để không làm sai thời gian).
+
+    python benchmark.py -o baseline.json
+    python benchmark.py --suite queens --compare baseline.json
+"""
+import argparse
+import functools
+import inspect
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for folder in ('B1', 'B2', 'B3', 'B4'):
+    sys.path.append(os.path.join(ROOT, folder))
+sys.path.append(ROOT)
+
+from common.deadline import Deadline, search_with_deadline
+from common.instrument import Instrument
+from common.queens_eval import non_attacking_pairs
+
+
+# ------------------------
+# Đếm số lần gọi (common.instrument)
+# ------------------------
+QUEENS_METHODS = ('value', 'heuristic', 'batch_value', 'tracker')
+EVALUATIONS = ('value', 'heuristic', 'batch_value.items', 'tracker.delta')
+NODES = ('actions', 'possible_moves', 'candidate_moves')
+
+
+def with_instrument(solver, instrument):
+    """Truyền instrument cho solver nào có tham số instrument (để đo thời gian từng pha)"""
+    if 'instrument' in inspect.signature(solver).parameters:
+        return functools.partial(solver, instrument=instrument)
+    return solver
+
+
+def measure(instrument, **record):
+    """Thêm evaluations, nodes và thời gian từng pha của instrument vào record"""
+    counts = instrument.counts
+    record.setdefault('evaluations', sum(counts[k] for k in EVALUATIONS) or None)
+    record.setdefault('nodes', sum(counts[k] for k in NODES) or None)
+    record['phases'] = {name: p['seconds'] for name, p in instrument.report()['phases'].items()}
+    return record
+
+
+# ------------------------
+# N quân hậu (size = n)
+# ------------------------
+def queens_local(solver_name, problem_module='xephau_nosimpleai', problem_class='EightQueensProblem'):
+    def run(n):
+        import importlib
+        solvers = importlib.import_module('xephau_nosimpleai')
+        module = importlib.import_module(problem_module)
+        problem = getattr(module, problem_class)(n=n)
+        instrument = Instrument()
+        instrument.attach(problem, QUEENS_METHODS)
+        state = with_instrument(getattr(solvers, solver_name), instrument)(problem)
+        return measure(instrument, success=non_attacking_pairs(state) == problem.max_score)
+    return run
+
+
+def queens_swarm(module_name, solver_name):
+    def run(n):
+        import importlib
+        module = importlib.import_module(module_name)
+        problem = module.EightQueensProblem(n=n)
+        instrument = Instrument()
+        instrument.attach(problem, QUEENS_METHODS)
+        state, score = with_instrument(getattr(module, solver_name), instrument)(problem)
+        return measure(instrument, success=score == problem.max_score)
+    return run
+
+
+def queens_min_conflicts(n):
+    from xephau_nosimpleai import EightQueensProblem
+    from min_conflicts import min_conflicts
+    stats = {}
+    problem = EightQueensProblem(n=n)
+    state, score = min_conflicts(problem, greedy_init=True, stats=stats)
+    return {'success': score == problem.max_score, 'nodes': stats['steps']}
+
+
+def queens_simpleai(algorithm, seconds=5.0):
+    """astar/greedy gốc của simpleai (không giới hạn bộ nhớ), cắt sau seconds giây"""
+    def run(n):
+        from simpleai.search import astar, greedy
+        from xephau_heuristic import IncrementalQueensHeuristicProblem
+        problem = IncrementalQueensHeuristicProblem(n=n)
+        instrument = Instrument()
+        instrument.attach(problem, ('heuristic',))
+        search = {'astar': astar, 'greedy': greedy}[algorithm]
+        outcome = search_with_deadline(search, problem, Deadline(seconds), graph_search=True)
+        return measure(instrument, success=outcome.node is not None)
+    return run
+
+
+def queens_bounded(greedy):
+    def run(n):
+        from xephau_heuristic import IncrementalQueensHeuristicProblem
+        from bounded_astar import bounded_astar
+        problem = IncrementalQueensHeuristicProblem(n=n)
+        instrument = Instrument()
+        instrument.attach(problem, ('heuristic',))
+        stats = {}
+        result = bounded_astar(problem, frontier_cap=5000, greedy=greedy, max_expanded=5000, stats=stats)
+        return measure(instrument, success=result is not None, nodes=stats['expanded'])
+    return run
+
+
+# ------------------------
+# 8-puzzle (size = số bước đi ngẫu nhiên từ goal)
+# ------------------------
+def random_board(depth):
+    """Đi ngẫu nhiên depth bước (không quay lại ngay) từ goal, trả về bàn 3x3"""
+    from astar_8puzzle import EightPuzzle, GOAL
+    from astar_bitpacked_8puzzle import OPPOSITE
+    problem = EightPuzzle([[0] * 3] * 3)
+    state, prev = GOAL, None
+    for _ in range(depth):
+        action = random.choice([a for a in problem.actions(state) if a != OPPOSITE.get(prev)])
+        state, prev = problem.result(state, action), action
+    cells = [0 if tile == '_' else int(tile) for tile in state]
+    return [cells[i:i + 3] for i in range(0, 9, 3)]
+
+
+def puzzle_simpleai(algorithm, module_name='astar_8puzzle', **options):
+    def run(depth):
+        import importlib
+        from simpleai.search import astar, greedy
+        board = random_board(depth)
+        problem = importlib.import_module(module_name).EightPuzzle(board, **options)
+        instrument = Instrument()
+        instrument.attach(problem, ('actions', 'heuristic'))
+        search = {'astar': astar, 'greedy': greedy}[algorithm]
+        result = search(problem, graph_search=True)
+        return measure(instrument, success=result is not None and problem.is_goal(result.state))
+    return run
+
+
+def puzzle_custom(name):
+    def run(depth):
+        from astar_8puzzle import EightPuzzle, GOAL
+        board = random_board(depth)
+        problem = EightPuzzle(board)
+        instrument = Instrument()
+        instrument.attach(problem, ('actions',))
+        if name == 'packed':
+            from astar_bitpacked_8puzzle import astar_packed
+            result = astar_packed(problem)
+        elif name == 'bidirectional':
+            from bidirectional_8puzzle import bidirectional_search
+            result = bidirectional_search(problem)
+        elif name == 'bidirectional_pdb':
+            from bidirectional_8puzzle import bidirectional_search
+            from pattern_db import PatternDatabase
+            with PatternDatabase(GOAL) as pdb:
+                result = bidirectional_search(problem, pdb=pdb)
+        elif name == 'bidirectional_bfs':
+            from bidirectional_8puzzle import bidirectional_bfs
+            result = bidirectional_bfs(problem)
+        elif name == 'ida_star':
+            from npuzzle_idastar import SlidingPuzzle, ida_star
+            result = ida_star(SlidingPuzzle(board))
+            return {'success': result is not None and result.state == SlidingPuzzle(board).goal}
+        else:
+            from astar_8puzzle import table_search
+            result = table_search(problem)
+        return measure(instrument, success=result is not None and result.state == GOAL)
+    return run
+
+
+# ------------------------
+# Tic-tac-toe (size = số nước mở đầu ngẫu nhiên)
+# ------------------------
+def random_opening(plies):
+    """Bàn TicTacToe sau plies nước ngẫu nhiên, chưa kết thúc"""
+    from B4 import TicTacToe
+    while True:
+        game = TicTacToe([None, None])
+        for _ in range(plies):
+            game.make_move(random.choice(game.possible_moves()))
+            game.switch_player()
+            if game.is_over():
+                break
+        if not game.is_over():
+            return game
+
+
+def optimal(game, move):
+    """
+    Nước move có giữ được kết quả tốt nhất (thắng/hòa/thua) của thế cờ không;
+    không đòi thắng nhanh nhất vì Negamax của easyAI không phân biệt.
+    """
+    from tictactoe_solver import get_table, negamax
+    table = get_table()
+    me = game.mask(game.current_player)
+    opp = game.mask(3 - game.current_player)
+    values = {i: -negamax(opp, me | 1 << i, table) for i in game.possible_moves()}
+    outcome = lambda v: (v > 0) - (v < 0)
+    return outcome(values[move]) == outcome(max(values.values()))
+
+
+def game_ai(name):
+    def run(plies):
+        game = random_opening(plies)
+        instrument = Instrument()
+        instrument.attach(game, ('possible_moves',))
+        if name == 'negamax':
+            from easyAI import Negamax
+            move = Negamax(9)(game)
+        elif name == 'table':
+            from tictactoe_solver import TableAI
+            move = TableAI()(game)
+        else:
+            from mnk_game import MNKGame, AlphaBeta
+            mnk = MNKGame([None, None])
+            for i, v in enumerate(game.board):
+                if v:
+                    mnk.current_player = v
+                    mnk.make_move(i)
+            mnk.current_player = game.current_player
+            instrument.attach(mnk, ('candidate_moves',))
+            move = AlphaBeta(time_limit=1.0)(mnk)
+        return measure(instrument, success=optimal(game, move))
+    return run
+
+
+# suite -> (kích thước mặc định, {tên thuật toán: hàm run(size) -> dict})
+SUITES = {
+    'queens': ((8, 16), {
+        'hill_climbing': queens_local('hill_climbing'),
+        'simulated_annealing': queens_local('simulated_annealing'),
+        'genetic_algorithm': queens_local('genetic_algorithm'),
+        'hill_climbing_perm': queens_local('hill_climbing', 'queens_permutation', 'PermutationQueensProblem'),
+        'aco': queens_swarm('xephau_swarm', 'ant_colony_optimization'),
+        'aco_vec': queens_swarm('xephau_swarm', 'ant_colony_optimization_vec'),
+        'abc': queens_swarm('xephau_swarm', 'bee_colony'),
+        'abc_sync': queens_swarm('xephau_swarm', 'bee_colony_sync'),
+        'gwo': queens_swarm('xephau_swarm', 'gray_wolf_optimizer'),
+        'woa': queens_swarm('xephau_WCO', 'whale_optimization'),
+        'woa_sync': queens_swarm('xephau_WCO', 'whale_optimization_sync'),
+        'min_conflicts': queens_min_conflicts,
+        'greedy_simpleai': queens_simpleai('greedy'),
+        'astar_simpleai': queens_simpleai('astar'),
+        'greedy_bounded': queens_bounded(True),
+        'astar_bounded': queens_bounded(False),
+    }),
+    'puzzle': ((10, 20, 40), {
+        'astar': puzzle_simpleai('astar'),
+        'astar_incremental': puzzle_simpleai('astar', incremental=True),
+        'greedy': puzzle_simpleai('greedy', 'greedy_best_first_8puzzle'),
+        'astar_packed': puzzle_custom('packed'),
+        'bidirectional': puzzle_custom('bidirectional'),
+        'bidirectional_pdb': puzzle_custom('bidirectional_pdb'),
+        'bidirectional_bfs': puzzle_custom('bidirectional_bfs'),
+        'ida_star': puzzle_custom('ida_star'),
+        'table': puzzle_custom('table'),
+    }),
+    'games': ((2, 4), {
+        'negamax9': game_ai('negamax'),
+        'table_ai': game_ai('table'),
+        'mnk_alphabeta': game_ai('mnk'),
+    }),
+}
+
+
+# ------------------------
+# Chạy và tổng hợp
+# ------------------------
+def run_once(run, size, seed, trace=False):
+    random.seed(seed)
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        record = run(size)
+    finally:
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+        if trace:
+            tracemalloc.stop()
+    record['seconds'] = seconds
+    record['peak_memory'] = peak
+    return record
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return statistics.fmean(values) if values else None
+
+
+def benchmark(suites=None, algorithms=None, sizes=None, instances=5, repeat=1, seed=0,
+              memory=True, log=sys.stderr):
+    """Chạy các thuật toán đã chọn, trả về list bản ghi tổng hợp cho từng (suite, thuật toán, size)"""
+    results = []
+    for suite in suites or SUITES:
+        default_sizes, runners = SUITES[suite]
+        for name, run in runners.items():
+            if algorithms and not any(a in name for a in algorithms):
+                continue
+            try:
+                # Chạy nháp một lần để import module và dựng bảng không bị tính giờ
+                run_once(run, min(sizes or default_sizes), seed)
+            except ImportError as e:
+                print(f"Bỏ qua {suite}/{name}: {e}", file=log)
+                continue
+            for size in sizes or default_sizes:
+                key = {'suite': suite, 'algorithm': name, 'size': size}
+                runs = [run_once(run, size, seed + i)
+                        for i in range(instances) for _ in range(repeat)]
+                peak = run_once(run, size, seed, trace=True)['peak_memory'] if memory else None
+                times = [r['seconds'] for r in runs]
+                record = dict(
+                    key,
+                    runs=len(runs),
+                    success_rate=sum(bool(r['success']) for r in runs) / len(runs),
+                    time_mean=statistics.fmean(times),
+                    time_median=statistics.median(times),
+                    time_max=max(times),
+                    evaluations_mean=_mean(r.get('evaluations') for r in runs),
+                    nodes_mean=_mean(r.get('nodes') for r in runs),
+                    phases_mean={phase: _mean(r['phases'].get(phase) for r in runs)
+                                 for phase in runs[0].get('phases', {})},
+                    peak_memory=peak,
+                )
+                results.append(record)
+                print(f"{suite:7} {name:20} size={size:<3} thành công={record['success_rate']:.0%} "
+                      f"median={record['time_median'] * 1000:.1f}ms", file=log)
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.005):
+    """
+    So với baseline (cùng suite/thuật toán/size). Trả về list (bản ghi, lý do)
+    cho các trường hợp chậm hơn quá tolerance (và hơn min_seconds), tỉ lệ
+    thành công giảm, hoặc số lần đánh giá tăng quá tolerance.
+    """
+    index = {(b['suite'], b['algorithm'], b['size']): b for b in baseline['results']}
+    regressions = []
+    for r in results:
+        b = index.get((r['suite'], r['algorithm'], r['size']))
+        if b is None:
+            continue
+        reasons = []
+        if (r['time_median'] > b['time_median'] * (1 + tolerance)
+                and r['time_median'] - b['time_median'] > min_seconds):
+            reasons.append(f"thời gian {b['time_median']:.4f}s -> {r['time_median']:.4f}s")
+        if r['success_rate'] < b['success_rate'] - 1e-9:
+            reasons.append(f"thành công {b['success_rate']:.0%} -> {r['success_rate']:.0%}")
+        if (r['evaluations_mean'] is not None and b['evaluations_mean']
+                and r['evaluations_mean'] > b['evaluations_mean'] * (1 + tolerance)):
+            reasons.append(f"đánh giá {b['evaluations_mean']:.0f} -> {r['evaluations_mean']:.0f}")
+        if reasons:
+            regressions.append((r, reasons))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark các thuật toán B1-B4, xuất JSON")
+    parser.add_argument('--suite', nargs='+', choices=list(SUITES), help="mặc định: tất cả")
+    parser.add_argument('--algorithms', nargs='+', help="chỉ chạy thuật toán có tên chứa các chuỗi này")
+    parser.add_argument('--sizes', nargs='+', type=int, help="n / độ sâu / số nước mở đầu")
+    parser.add_argument('--instances', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="bỏ lần chạy đo tracemalloc")
+    parser.add_argument('-o', '--output', help="file JSON kết quả (mặc định: stdout)")
+    parser.add_argument('--compare', help="file JSON baseline để so sánh")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.suite, args.algorithms, args.sizes, args.instances,
+                        args.repeat, args.seed, not args.no_memory)
+    report = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for r, reasons in regressions:
+            print(f"CHẬM HƠN {r['suite']}/{r['algorithm']} size={r['size']}: {'; '.join(reasons)}",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("Không có thuật toán nào chậm hơn baseline", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
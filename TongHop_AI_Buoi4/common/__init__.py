@@ -0,0 +1 @@
+"""Phần dùng chung cho các bài B1-B4 (import sau khi thêm thư mục gốc vào sys.path)."""
@@ -0,0 +1,156 @@
+import time
+from collections import namedtuple
+
+
+class DeadlineExceeded(Exception):
+    """Ném ra từ các hook (viewer simpleai, hàm scoring của easyAI) khi hết giờ"""
+
+
+class Deadline:
+    """
+    Hạn chót theo đồng hồ thực kiêm token hủy hợp tác cho các solver.
+
+    Deadline(0.5) hết hạn sau 0.5 giây, Deadline() chỉ hết hạn khi cancel().
+    Deadline(1.0, parent=d) hết hạn khi hết 1 giây hoặc khi d hết hạn (ví dụ
+    giới hạn mỗi nước đi bên trong giới hạn cả ván).
+
+    Solver nhận deadline=None, gọi expired() trong vòng lặp trong cùng và
+    khi hết hạn thì trả về kết quả tốt nhất tới lúc đó (thuật toán tìm đường
+    không có kết quả dở dang thì trả về None). Bên gọi xem deadline.timed_out
+    để biết kết quả có bị cắt ngang không.
+
+    Dùng time.monotonic; expired() chỉ tốn một lần đọc đồng hồ.
+    """
+
+    def __init__(self, seconds=None, parent=None):
+        self.end = None if seconds is None else time.monotonic() + seconds
+        self.parent = parent
+        self.cancelled = False
+        self.timed_out = False
+
+    def expired(self):
+        if self.timed_out:
+            return True
+        if (self.cancelled or (self.end is not None and time.monotonic() >= self.end)
+                or (self.parent is not None and self.parent.expired())):
+            self.timed_out = True
+        return self.timed_out
+
+    def check(self):
+        """Ném DeadlineExceeded nếu đã hết hạn"""
+        if self.expired():
+            raise DeadlineExceeded
+
+    def cancel(self):
+        """Hủy từ bên ngoài (thread khác, callback); solver dừng ở lần kiểm tra kế tiếp"""
+        self.cancelled = True
+
+    def remaining(self):
+        """Số giây còn lại (None nếu không giới hạn thời gian, 0 nếu đã hết hạn)"""
+        if self.expired():
+            return 0.0
+        ends = [d.end for d in self._chain() if d.end is not None]
+        return max(0.0, min(ends) - time.monotonic()) if ends else None
+
+    def _chain(self):
+        deadline = self
+        while deadline is not None:
+            yield deadline
+            deadline = deadline.parent
+
+
+class _NoDeadline:
+    """Deadline khi không giới hạn: expired() luôn False"""
+    timed_out = False
+
+    def expired(self):
+        return False
+
+    def check(self):
+        pass
+
+    def remaining(self):
+        return None
+
+
+NO_DEADLINE = _NoDeadline()
+
+
+# ------------------------
+# Hook cho simpleai
+# ------------------------
+# Kết quả của search_with_deadline: node (hoặc None) và cờ bị cắt ngang vì hết giờ
+SearchOutcome = namedtuple('SearchOutcome', 'node timed_out')
+
+# Method của problem được gọi cho từng node; kiểm tra deadline ở đây thì một
+# vòng lặp của local search (mở rộng cả láng giềng) cũng bị cắt ngang kịp
+CHECKED_METHODS = ('actions', 'value', 'heuristic', 'is_goal')
+
+
+class DeadlineViewer:
+    """
+    Viewer tối giản cho local search của simpleai (hill_climbing,
+    simulated_annealing, genetic, beam...): mỗi vòng lặp ghi lại node tốt
+    nhất của fringe rồi ném DeadlineExceeded nếu đã hết hạn.
+
+    Không kế thừa BaseViewer vì BaseViewer ghi log từng sự kiện dưới dạng
+    chuỗi, tốn hơn cả bản thân thuật toán.
+    """
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.best = None
+
+    def event(self, name, *params):
+        if name == 'new_iteration':
+            fringe = params[0]
+            if fringe:
+                self.best = fringe[0]
+            self.deadline.check()
+
+
+def _checked(method, deadline):
+    def wrapper(*args, **kwargs):
+        deadline.check()
+        return method(*args, **kwargs)
+    return wrapper
+
+
+def search_with_deadline(search, problem, deadline=None, **kwargs):
+    """
+    Chạy một thuật toán của simpleai với deadline, ví dụ
+    search_with_deadline(hill_climbing, problem, Deadline(0.1), iterations_limit=1000).
+    Trả về SearchOutcome(node, timed_out).
+
+    Các method trong CHECKED_METHODS được bọc tạm trên instance problem để
+    kiểm tra deadline ở từng node (gỡ ra khi xong, wrapper có sẵn trên
+    instance như của Instrument được giữ nguyên).
+
+    - Local search (simpleai.search.local): thêm DeadlineViewer, hết hạn thì
+      node là node tốt nhất của vòng lặp gần nhất (None nếu chưa xong node
+      đầu tiên).
+    - Tìm kiếm cây/đồ thị (astar, greedy, ...): không dùng viewer vì simpleai
+      sắp xếp lại cả fringe ở mỗi sự kiện; hết hạn thì node là None vì
+      đường đi dở dang không phải lời giải.
+    """
+    deadline = deadline or NO_DEADLINE
+    local = search.__module__.endswith('.local')
+    viewer = DeadlineViewer(deadline) if local else None
+
+    own = vars(problem)
+    saved = {name: own[name] for name in CHECKED_METHODS if name in own}
+    wrapped = [name for name in CHECKED_METHODS if callable(getattr(problem, name, None))]
+    for name in wrapped:
+        setattr(problem, name, _checked(getattr(problem, name), deadline))
+    try:
+        if local:
+            kwargs['viewer'] = viewer
+        return SearchOutcome(search(problem, **kwargs), False)
+    except DeadlineExceeded:
+        return SearchOutcome(viewer.best if local else None, True)
+    finally:
+        for name in wrapped:
+            if name in saved:
+                setattr(problem, name, saved[name])
+            else:
+                delattr(problem, name)
@@ -0,0 +1,152 @@
+import time
+from collections import Counter
+from contextlib import nullcontext
+from types import MethodType
+
+# Các method thường gặp trên lớp bài toán / trò chơi của B1-B4
+# (EightPuzzle, EightQueensProblem, EightQueensHeuristicProblem, TicTacToe, ...)
+DEFAULT_METHODS = (
+    'actions', 'result', 'heuristic', 'is_goal', 'value', 'batch_value',
+    'neighbors', 'tracker', 'crossover', 'mutate',
+    'possible_moves', 'make_move', 'unmake_move', 'scoring', 'win', 'lose', 'is_over',
+)
+
+
+class Instrument:
+    """
+    Bộ đếm và đồng hồ theo pha, chỉ hoạt động khi được bật rõ ràng.
+
+    - attach(obj) bọc các method của riêng instance obj (mặc định mọi tên
+      trong DEFAULT_METHODS mà obj có) để đếm số lần gọi; batch_value còn
+      đếm số cá thể ('batch_value.items'), tracker() bọc tiếp delta/move của
+      trạng thái trả về. detach(obj) gỡ bỏ, obj trở lại như cũ (kể cả các
+      wrapper đã có sẵn trên instance trước khi attach). Instance
+      không attach thì không tốn gì.
+    - phase(name) là context manager cộng dồn thời gian và số lần vào pha.
+      Các solver nhận instrument=None và dùng NULL_INSTRUMENT khi tắt, mà
+      phase() của nó chỉ trả về một nullcontext dùng chung.
+    - report() gom số lần gọi, thời gian từng pha và cache_info() của các
+      object đã attach (ví dụ MemoizedValue).
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.phase_seconds = Counter()
+        self.phase_calls = Counter()
+        self._attached = []
+
+    # --- Đếm ---
+    def count(self, name, k=1):
+        self.counts[name] += k
+
+    def attach(self, obj, methods=None, prefix=''):
+        names = [m for m in (methods or DEFAULT_METHODS) if callable(getattr(obj, m, None))]
+        # Giá trị có sẵn trên instance (wrapper khác, hàm gán riêng) để detach trả lại
+        own = vars(obj)
+        saved = {name: own[name] for name in names if name in own}
+        for name in names:
+            self._wrap(obj, name, prefix + name)
+        self._attached.append((obj, names, saved))
+        return obj
+
+    def detach(self, obj):
+        """Gỡ lần attach gần nhất trên obj, trả lại đúng các giá trị của instance trước đó"""
+        for i in range(len(self._attached) - 1, -1, -1):
+            attached, names, saved = self._attached[i]
+            if attached is obj:
+                for name in names:
+                    if name in saved:
+                        setattr(obj, name, saved[name])
+                    else:
+                        obj.__dict__.pop(name, None)
+                del self._attached[i]
+                return obj
+        return obj
+
+    def _wrap(self, obj, name, key):
+        method = getattr(obj, name)
+        func = getattr(method, '__func__', None)
+        if func is None:
+            # Hàm thường gán trên instance: không nhận self
+            def func(self_, *args, **kwargs):
+                return method(*args, **kwargs)
+        counts = self.counts
+
+        if name == 'batch_value':
+            def wrapper(self_, population, *args, **kwargs):
+                counts[key] += 1
+                counts[key + '.items'] += len(population)
+                return func(self_, population, *args, **kwargs)
+        elif name == 'tracker':
+            instrument = self
+
+            def wrapper(self_, *args, **kwargs):
+                counts[key] += 1
+                state = func(self_, *args, **kwargs)
+                for method in ('delta', 'move'):
+                    instrument._wrap(state, method, f'{key}.{method}')
+                return state
+        else:
+            def wrapper(self_, *args, **kwargs):
+                counts[key] += 1
+                return func(self_, *args, **kwargs)
+
+        # MethodType (không phải hàm thường) để deepcopy (easyAI play()) gắn lại
+        # wrapper vào bản sao thay vì gọi về object gốc
+        setattr(obj, name, MethodType(wrapper, obj))
+
+    # --- Pha ---
+    def phase(self, name):
+        return _Phase(self, name)
+
+    # --- Báo cáo ---
+    def report(self):
+        caches = {}
+        for obj, _, _ in self._attached:
+            if hasattr(obj, 'cache_info'):
+                caches[type(obj).__name__] = obj.cache_info()._asdict()
+        return {
+            'counts': dict(self.counts),
+            'phases': {name: {'seconds': self.phase_seconds[name], 'calls': self.phase_calls[name]}
+                       for name in self.phase_calls},
+            'caches': caches,
+        }
+
+    def __str__(self):
+        lines = [f"{name:24} {n:>10}" for name, n in sorted(self.counts.items())]
+        total = sum(self.phase_seconds.values()) or 1
+        for name in self.phase_calls:
+            seconds = self.phase_seconds[name]
+            lines.append(f"[{name}] {self.phase_calls[name]:>6} lần {seconds:9.4f}s ({seconds / total:.0%})")
+        return '\n'.join(lines)
+
+
+class _Phase:
+    __slots__ = ('instrument', 'name', 'start')
+
+    def __init__(self, instrument, name):
+        self.instrument = instrument
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.instrument.phase_seconds[self.name] += time.perf_counter() - self.start
+        self.instrument.phase_calls[self.name] += 1
+        return False
+
+
+class _NullInstrument:
+    """Instrument khi tắt: phase() trả về nullcontext dùng chung, count() không làm gì"""
+    _context = nullcontext()
+
+    def phase(self, name):
+        return self._context
+
+    def count(self, name, k=1):
+        pass
+
+
+NULL_INSTRUMENT = _NullInstrument()
@@ -0,0 +1,65 @@
+from array import array
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+def state_key(state):
+    """
+    Khóa gọn cho một state: mỗi hàng một byte khi n <= 256, ngược lại 4 byte.
+    Tuple, list và mảng NumPy đều dùng được (mảng NumPy lấy thẳng buffer).
+    """
+    if len(state) <= 256:
+        return bytes(state)
+    return array('I', state).tobytes()
+
+
+class MemoizedValue:
+    """
+    Mixin ghi nhớ value(state) trong một LRU có giới hạn, an toàn đa luồng.
+    Đặt trước lớp bài toán khi kế thừa:
+
+        class CachedEightQueensProblem(MemoizedValue, EightQueensProblem):
+            pass
+
+    cache_size: số state tối đa được giữ (mặc định 100000).
+    cache_info() trả về CacheInfo(hits, misses, maxsize, currsize).
+    """
+    cache_size = 100000
+
+    def __init__(self, *args, cache_size=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if cache_size is not None:
+            self.cache_size = cache_size
+        self._memo = OrderedDict()
+        self._memo_lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def value(self, state):
+        key = state_key(state)
+        with self._memo_lock:
+            score = self._memo.get(key)
+            if score is not None:
+                self._memo.move_to_end(key)
+                self._hits += 1
+                return score
+            self._misses += 1
+
+        # Tính ngoài khóa; hai luồng cùng tính một state chỉ tốn thêm một lần
+        score = super().value(state)
+        with self._memo_lock:
+            self._memo[key] = score
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return score
+
+    def cache_info(self):
+        with self._memo_lock:
+            return CacheInfo(self._hits, self._misses, self.cache_size, len(self._memo))
+
+    def cache_clear(self):
+        with self._memo_lock:
+            self._memo.clear()
+            self._hits = self._misses = 0
@@ -0,0 +1,85 @@
+import os
+import random
+import time
+from collections import namedtuple
+from multiprocessing import Pool
+
+PortfolioResult = namedtuple('PortfolioResult', 'state score seed runs')
+
+
+class ScoredSolver:
+    """
+    Bọc solver chỉ trả về state (hill climbing, simulated annealing, genetic
+    algorithm) thành solver trả về (state, problem.value(state)) như các
+    thuật toán bầy đàn. Là class (không phải closure) để pickle được.
+    """
+
+    def __init__(self, solver):
+        self.solver = solver
+
+    def __call__(self, problem, **kwargs):
+        state = self.solver(problem, **kwargs)
+        return state, problem.value(state)
+
+
+def _run_one(task):
+    """Chạy trong worker: đặt seed, tạo problem mới rồi gọi solver"""
+    solver, problem_factory, seed, kwargs = task
+    random.seed(seed)
+    start = time.perf_counter()
+    problem = problem_factory()
+    result = solver(problem, **kwargs)
+    if not (isinstance(result, tuple) and len(result) == 2):
+        raise TypeError(f"{getattr(solver, '__name__', solver)} phải trả về (state, score); "
+                        "solver chỉ trả về state thì bọc bằng ScoredSolver")
+    state, score = result
+    perfect = score == problem.max_score
+    return {
+        'seed': seed,
+        'state': tuple(state),
+        'score': score,
+        'perfect': perfect,
+        'seconds': time.perf_counter() - start,
+        'status': 'done',
+    }
+
+
+def run_portfolio(solver, problem_factory, seeds=None, processes=None, stop_on_perfect=True, **kwargs):
+    """
+    Chạy song song nhiều lần một thuật toán ngẫu nhiên với các seed khác nhau.
+
+    solver: hàm solver(problem, **kwargs) trả về (state, score), ví dụ
+        ant_colony_optimization, bee_colony, gray_wolf_optimizer,
+        whale_optimization; solver chỉ trả về state thì bọc bằng
+        ScoredSolver, ví dụ ScoredSolver(simulated_annealing).
+    problem_factory: hàm không tham số tạo problem mới (class, hoặc
+        functools.partial(EightQueensProblem, n=16)); phải pickle được, nên
+        không dùng lambda.
+    seeds: số lần chạy K (seed 0..K-1) hoặc danh sách seed; mặc định = số CPU.
+        Không có seed nào -> ValueError.
+
+    Ngay khi một lần chạy đạt điểm tối đa, pool bị terminate để dừng mọi
+    worker còn lại. Trả về PortfolioResult(state, score, seed, runs), trong
+    đó runs có thống kê từng seed (các seed bị dừng sớm có status 'cancelled').
+    """
+    processes = processes or os.cpu_count()
+    if seeds is None:
+        seeds = processes
+    seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+    if not seeds:
+        raise ValueError("run_portfolio cần ít nhất một seed")
+    tasks = [(solver, problem_factory, seed, kwargs) for seed in seeds]
+
+    finished = {}
+    best = None
+    with Pool(processes) as pool:
+        for run in pool.imap_unordered(_run_one, tasks):
+            finished[run['seed']] = run
+            if best is None or run['score'] > best['score']:
+                best = run
+            if run['perfect'] and stop_on_perfect:
+                pool.terminate()
+                break
+
+    runs = [finished.get(seed, {'seed': seed, 'status': 'cancelled'}) for seed in seeds]
+    return PortfolioResult(best['state'], best['score'], best['seed'], runs)
@@ -0,0 +1,46 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Bản ghi tiến trình mà các hàm iter_* yield sau mỗi vòng lặp:
+# iteration (số vòng đã chạy xong, 0 = quần thể ban đầu), best_state và
+# best_score tốt nhất tới lúc đó, diversity của quần thể hiện tại, elapsed
+# (giây từ lúc bắt đầu, tính cả thời gian bên gọi xử lý giữa các lần yield).
+# best_state được dùng chung với solver, bên gọi cần sửa thì tự sao chép.
+Progress = namedtuple('Progress', 'iteration best_state best_score diversity elapsed')
+
+
+def diversity(population):
+    """
+    Độ đa dạng của quần thể trong [0, 1]: trung bình trên các vị trí (cột)
+    của (số giá trị khác nhau - 1) / (số giá trị khác nhau tối đa - 1).
+    0 khi mọi cá thể trùng nhau, 1 khi mỗi cột đều khác nhau hết mức có thể.
+    """
+    pop = np.sort(np.asarray(population), axis=0)
+    if pop.ndim != 2 or len(pop) < 2:
+        return 0.0
+    size, n = pop.shape
+    distinct = 1 + np.count_nonzero(np.diff(pop, axis=0), axis=0)
+    most = min(size, n)  # giá trị (hàng) nằm trong [0, n)
+    return float((distinct - 1).mean() / max(1, most - 1))
+
+
+class Clock:
+    """Đồng hồ cho iter_*: Clock()(iteration, best_state, best_score, population) -> Progress"""
+    __slots__ = ('start',)
+
+    def __init__(self):
+        self.start = time.perf_counter()
+
+    def __call__(self, iteration, best_state, best_score, population):
+        return Progress(iteration, best_state, best_score, diversity(population),
+                        time.perf_counter() - self.start)
+
+
+def last(progress):
+    """Chạy hết một iter_* và trả về Progress cuối cùng (None nếu không có vòng nào)"""
+    record = None
+    for record in progress:
+        pass
+    return record
@@ -0,0 +1,32 @@
+import numpy as np
+
+from common.queens_eval import max_pairs
+
+
+def batch_attacking_pairs(population):
+    """
+    Số cặp tấn công nhau của cả quần thể trong một lần tính vector hóa.
+
+    population: mảng 2-D (số cá thể x n), giá trị hàng trong [0, n).
+    Mỗi cá thể p được dời chỉ số đi p * width, nên một lần np.bincount trên
+    mảng phẳng cho ra histogram riêng của từng cá thể (hàng, đường chéo,
+    đường chéo phụ); mỗi đường có k quân góp C(k, 2) cặp.
+    """
+    pop = np.asarray(population, dtype=np.int64)
+    if pop.ndim != 2:
+        raise ValueError("population phải là mảng 2 chiều (số cá thể x n)")
+    size, n = pop.shape
+    cols = np.arange(n)
+    ids = np.arange(size)[:, None]
+    attacking = np.zeros(size, dtype=np.int64)
+    for lines, width in ((pop, n), (pop - cols + n - 1, 2 * n - 1), (pop + cols, 2 * n - 1)):
+        counts = np.bincount((lines + ids * width).ravel(), minlength=size * width)
+        counts = counts.reshape(size, width)
+        attacking += (counts * (counts - 1) // 2).sum(axis=1)
+    return attacking
+
+
+def batch_values(population):
+    """value() cho cả quần thể: số cặp không tấn công nhau của từng cá thể"""
+    pop = np.asarray(population)
+    return max_pairs(pop.shape[1]) - batch_attacking_pairs(pop)
@@ -0,0 +1,32 @@
+from collections import Counter
+
+
+def max_pairs(n):
+    """Số cặp quân hậu tối đa: C(n, 2) (n = 8 -> 28)"""
+    return n * (n - 1) // 2
+
+
+def attacking_pairs(state):
+    """
+    Số cặp quân hậu tấn công nhau, O(n).
+
+    Đếm số quân trên mỗi hàng, đường chéo (row - col) và đường chéo phụ
+    (row + col); một đường có k quân tạo ra C(k, 2) cặp. Hai quân ở hai cột
+    khác nhau không thể chung hơn một đường, nên cộng ba phần không bị trùng
+    và kết quả khớp với vòng lặp is_attacking trên mọi cặp.
+    """
+    total = 0
+    for counts in (
+        Counter(state),
+        Counter([row - col for col, row in enumerate(state)]),
+        Counter([row + col for col, row in enumerate(state)]),
+    ):
+        for k in counts.values():
+            if k > 1:
+                total += k * (k - 1) // 2
+    return total
+
+
+def non_attacking_pairs(state):
+    """Hàm đánh giá value(): số cặp không tấn công nhau, tối đa max_pairs(n)"""
+    return max_pairs(len(state)) - attacking_pairs(state)
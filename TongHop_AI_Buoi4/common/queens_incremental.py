@@ -0,0 +1,56 @@
+from common.queens_eval import attacking_pairs
+from common.queens_state import QueensState
+
+
+class IncrementalQueensMixin:
+    """
+    Mixin cho các bài toán n quân hậu dùng simpleai (state là tuple, action là
+    (col, new_row)). Đặt trước lớp bài toán khi kế thừa.
+
+    - actions(state) dựng QueensState một lần, tính delta O(1) cho mọi nước
+      đi, rồi trả về các action (tuple dựng sẵn, dùng lại) xếp theo delta
+      tăng dần: nước đi giảm xung đột nhiều nhất đứng đầu.
+    - result(state, action) ghi lại số cặp xung đột của state con
+      = xung đột của cha + delta, nên heuristic()/value() của state con mà
+      simpleai gọi ngay sau đó chỉ là một lần tra dict, không đếm lại O(n).
+
+    Bộ nhớ đệm chỉ giữ các con của lần mở rộng gần nhất.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._moves = [(col, row) for col in range(self.n) for row in range(self.n)]
+        self._parent = None
+        self._child_h = {}
+        self._h = {}
+
+    def actions(self, state):
+        tracker = QueensState(state)
+        n = self.n
+        h = tracker.conflicts
+        scored = []
+        for col, current in enumerate(state):
+            base = col * n
+            for row in range(n):
+                if row != current:
+                    scored.append((tracker.delta(col, row), base + row))
+        scored.sort()
+        moves = self._moves
+        actions = [moves[k] for _, k in scored]
+        self._parent = state
+        self._child_h = {moves[k]: h + d for d, k in scored}
+        self._h = {}
+        return actions
+
+    def result(self, state, action):
+        child = super().result(state, action)
+        if state is self._parent:
+            self._h[child] = self._child_h[action]
+        return child
+
+    def heuristic(self, state):
+        h = self._h.get(state)
+        return attacking_pairs(state) if h is None else h
+
+    def value(self, state):
+        return self.max_score - self.heuristic(state)
@@ -0,0 +1,164 @@
+import random
+
+from common.queens_eval import max_pairs
+
+
+class QueensState:
+    """
+    Trạng thái n quân hậu có giữ sẵn số quân trên mỗi hàng, đường chéo và
+    đường chéo phụ, để đánh giá một nước đi (đưa quân ở cột col sang hàng row)
+    trong O(1) mà không phải tạo tuple mới rồi đếm lại từ đầu.
+
+    conflicts = số cặp tấn công nhau; delta() < 0 nghĩa là nước đi tốt hơn.
+    """
+
+    def __init__(self, state):
+        n = len(state)
+        self.n = n
+        self.rows = list(state)
+        self.row_count = [0] * n
+        self.diag = [0] * (2 * n - 1)
+        self.anti = [0] * (2 * n - 1)
+        for col, row in enumerate(self.rows):
+            self.row_count[row] += 1
+            self.diag[row - col + n - 1] += 1
+            self.anti[row + col] += 1
+        self.conflicts = sum(
+            k * (k - 1) // 2
+            for counts in (self.row_count, self.diag, self.anti)
+            for k in counts
+        )
+
+    def delta(self, col, row):
+        """
+        Độ thay đổi số cặp xung đột nếu quân ở cột col sang hàng row.
+        Hàng/đường chéo mới luôn khác đường cũ, nên chỉ cần: bỏ đi (k - 1)
+        cặp ở mỗi đường cũ và thêm k cặp ở mỗi đường mới.
+        """
+        old = self.rows[col]
+        if old == row:
+            return 0
+        n1 = self.n - 1
+        return (
+            self.row_count[row] + self.diag[row - col + n1] + self.anti[row + col]
+            - self.row_count[old] - self.diag[old - col + n1] - self.anti[old + col] + 3
+        )
+
+    def move(self, col, row):
+        d = self.delta(col, row)
+        old = self.rows[col]
+        n1 = self.n - 1
+        self.row_count[old] -= 1
+        self.diag[old - col + n1] -= 1
+        self.anti[old + col] -= 1
+        self.row_count[row] += 1
+        self.diag[row - col + n1] += 1
+        self.anti[row + col] += 1
+        self.rows[col] = row
+        self.conflicts += d
+
+    def moves(self):
+        """Mọi nước đi (col, row), cùng thứ tự với EightQueensProblem.neighbors"""
+        rows = self.rows
+        for col in range(self.n):
+            current = rows[col]
+            for row in range(self.n):
+                if row != current:
+                    yield col, row
+
+    def random_move(self):
+        """
+        Chọn đều một nước đi trong n*(n-1) nước; dùng đúng một lần
+        randrange nên cho cùng kết quả với random.choice(list(neighbors)).
+        """
+        k = random.randrange(self.n * (self.n - 1))
+        col, row = divmod(k, self.n - 1)
+        if row >= self.rows[col]:
+            row += 1
+        return col, row
+
+    def value(self):
+        return max_pairs(self.n) - self.conflicts
+
+    def state(self):
+        return tuple(self.rows)
+
+
+class PermutationState:
+    """
+    Trạng thái n quân hậu dạng hoán vị: mỗi hàng đúng một quân, nên chỉ còn
+    xung đột trên đường chéo. Nước đi là đổi hàng của hai cột (i, j).
+
+    Cùng giao diện với QueensState (delta, move, moves, random_move, value,
+    state) để hill climbing / SA dùng được mà không phải sửa.
+    """
+
+    def __init__(self, state):
+        n = len(state)
+        if sorted(state) != list(range(n)):
+            raise ValueError(f"State không phải hoán vị của 0..{n - 1}: {tuple(state)}")
+        self.n = n
+        self.rows = list(state)
+        self.diag = [0] * (2 * n - 1)
+        self.anti = [0] * (2 * n - 1)
+        for col, row in enumerate(self.rows):
+            self.diag[row - col + n - 1] += 1
+            self.anti[row + col] += 1
+        self.conflicts = sum(
+            k * (k - 1) // 2
+            for counts in (self.diag, self.anti)
+            for k in counts
+        )
+
+    def _swap(self, i, j):
+        """
+        Đổi hàng của cột i và j, trả về độ thay đổi số cặp xung đột.
+        Nhấc một quân khỏi đường có k quân mất k - 1 cặp, đặt vào đường có
+        k quân thêm k cặp; nhấc cả hai quân trước rồi mới đặt lại nên các
+        đường dùng chung được tính đúng.
+        """
+        rows, diag, anti = self.rows, self.diag, self.anti
+        n1 = self.n - 1
+        ri, rj = rows[i], rows[j]
+        change = 0
+        for col, row in ((i, ri), (j, rj)):
+            diag[row - col + n1] -= 1
+            anti[row + col] -= 1
+            change -= diag[row - col + n1] + anti[row + col]
+        for col, row in ((i, rj), (j, ri)):
+            change += diag[row - col + n1] + anti[row + col]
+            diag[row - col + n1] += 1
+            anti[row + col] += 1
+        rows[i], rows[j] = rj, ri
+        return change
+
+    def delta(self, i, j):
+        """Độ thay đổi số cặp xung đột nếu đổi hàng hai cột i, j (O(1))"""
+        if i == j:
+            return 0
+        d = self._swap(i, j)
+        self._swap(i, j)
+        return d
+
+    def move(self, i, j):
+        if i != j:
+            self.conflicts += self._swap(i, j)
+
+    def moves(self):
+        """Mọi cặp cột (i, j) với i < j"""
+        for i in range(self.n - 1):
+            for j in range(i + 1, self.n):
+                yield i, j
+
+    def random_move(self):
+        i = random.randrange(self.n)
+        j = random.randrange(self.n - 1)
+        if j >= i:
+            j += 1
+        return i, j
+
+    def value(self):
+        return max_pairs(self.n) - self.conflicts
+
+    def state(self):
+        return tuple(self.rows)